@@ -1,10 +1,20 @@
 import sys
 import os
-from views.MainWindow import MainWindow
-from PyQt5.QtWidgets import QApplication
-from PyQt5.QtCore import Qt
+from core.single_instance import parse_args, args_to_message, send_message, SingleInstanceServer
 
 if __name__ == '__main__':
+    args = parse_args(sys.argv[1:])
+    message = args_to_message(args)
+
+    # 已有实例在运行时，只转发参数后立即退出，不加载界面组件
+    if not args.new_instance and send_message(message):
+        sys.exit(0)
+
+    from config import LOW_POWER_MODE
+    from views.MainWindow import MainWindow
+    from PyQt5.QtWidgets import QApplication
+    from PyQt5.QtCore import Qt
+
     # 启用高分屏支持
     os.environ['QT_ENABLE_HIGHDPI_SCALING'] = '1'
     os.environ['QT_SCALE_FACTOR_ROUNDING_POLICY'] = 'PassThrough'
@@ -14,7 +24,28 @@ if __name__ == '__main__':
     QApplication.setAttribute(Qt.AA_UseHighDpiPixmaps, True)
     
     app = QApplication(sys.argv)
+
+    server = SingleInstanceServer()
+    if not args.new_instance and not server.listen():
+        # 与同时启动的另一个实例竞争失败，对方已在监听，改为转发参数后退出
+        if send_message(message):
+            sys.exit(0)
     
     window = MainWindow()
-    window.showMaximized()
+    window.set_low_power(args.low_power or LOW_POWER_MODE)
+    server.messageReceived.connect(window.handle_instance_message)
+
+    if args.prewarm:
+        # 预热模式：窗口保持隐藏，关闭后回到托盘
+        from views.TrayIcon import TrayIcon
+        app.setQuitOnLastWindowClosed(False)
+        window.set_keep_alive(True)
+        tray = TrayIcon(window)
+        tray.show()
+    else:
+        window.showMaximized()
+
+    window.handle_instance_message(message)
+    if args.measure_idle:
+        window.measure_idle(args.measure_idle)
     sys.exit(app.exec_())
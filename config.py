@@ -4,24 +4,52 @@ ROOT_PATH = Path(__file__).parent
 
 # 应用程序配置
 APP_NAME = "数位分析器"
+APP_ID = "RegisterAnalysisFluentVer"  # 单实例通信使用的标识
 MAIN_ICON = str(ROOT_PATH.joinpath('titleico.svg'))
 
 # 窗口配置
 WINDOW_WIDTH = 1000
 WINDOW_HEIGHT = 720
+LOW_POWER_MODE = False  # 默认是否开启低功耗模式（关闭 Mica 特效和动画）
 
 # 数位配置
 MAX_DIGIT = 16  # 最大数位数量
 MAX_BIT_PER_DIGIT = 4  # 每数位的比特数
 MAX_BIT_COUNT = MAX_DIGIT * MAX_BIT_PER_DIGIT  # 总比特数
 
+# 校验配置
+CHECKSUM_BYTE_COUNT = MAX_BIT_COUNT // 8  # 计算校验时寄存器值的字节数
+
 # 颜色配置
 BIT_HIGH_COLOR = "yellow"
 BIT_LOW_COLOR = ""
+BIT_DIFF_COLOR = "red"  # 对比模式下差异比特位的边框颜色
 
 # 输入限制
 MAX_SHIFT_VALUE = 64
 
+# 结果输入框的自适应防抖
+INPUT_IMMEDIATE_COST = 8  # 上一次更新耗时低于该值（毫秒）时立即更新
+INPUT_IMMEDIATE_LENGTH = 256  # 输入超过该长度时总是延迟更新
+INPUT_DEBOUNCE_MIN = 30  # 最短防抖延迟（毫秒）
+INPUT_DEBOUNCE_MAX = 300  # 最长防抖延迟（毫秒）
+
+# 跟踪导入配置
+IMPORT_BLOCK_SIZE = 16 * 1024 * 1024  # 按块读取文本的块大小（字节）
+IMPORT_WORD_BYTES = 4  # 转储格式中每个样本的字节数
+IMPORT_BYTE_ORDER = "little"  # 转储格式中样本的字节序
+
+# 操作日志回放配置
+REPLAY_CHECKPOINT_INTERVAL = 4096  # 检查点间隔（操作数，须为 2 的幂）
+
+# 寄存器库配置
+LIBRARY_PATH = Path.home() / ".register_analysis" / "library.db"  # 寄存器库数据库文件
+LIBRARY_SEARCH_LIMIT = 200  # 查询最多显示的记录数
+
+# 单实例配置
+INSTANCE_CONNECT_TIMEOUT = 200  # 连接已运行实例的超时时间（毫秒）
+INSTANCE_LOCK_TIMEOUT = 2000  # 等待单实例锁文件的超时时间（毫秒）
+
 # 状态消息
 STATUS_OK = "就绪"
 STATUS_ERROR = "错误：输入无效"
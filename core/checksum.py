@@ -0,0 +1,491 @@
+"""
+校验计算模块 - 奇偶校验、置位计数、CRC 与简单校验和
+
+所有计算既支持单个寄存器值，也支持批量数据（转储文件的字节区间、
+或逐字处理的跟踪数组）。CRC 采用查表法，查找表按多项式配置缓存。
+
+大块数据的 CRC 利用 CRC 的线性：把数据切成多条等长的通道，用 NumPy
+同时对所有通道逐字节查表，再用"跨过 L 个零字节"的线性算子两两合并通道结果。
+"""
+
+import binascii
+import zlib
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, Tuple, Union
+
+import numpy as np
+
+BytesLike = Union[bytes, bytearray, memoryview]
+
+
+@dataclass(frozen=True)
+class CrcConfig:
+    """
+    CRC 参数配置（Rocksoft 模型）。
+
+    Attributes:
+        name: 配置名称
+        width: CRC 位宽（8、16 或 32）
+        poly: 生成多项式（不含最高位，正常书写顺序）
+        init: 初始值
+        ref_in: 输入字节是否按位反转
+        ref_out: 输出结果是否按位反转
+        xor_out: 输出异或值
+    """
+    name: str
+    width: int
+    poly: int
+    init: int = 0
+    ref_in: bool = False
+    ref_out: bool = False
+    xor_out: int = 0
+
+    @property
+    def mask(self) -> int:
+        return (1 << self.width) - 1
+
+
+# 常用 CRC 预设
+CRC_PRESETS: Dict[str, CrcConfig] = {
+    cfg.name: cfg for cfg in (
+        CrcConfig("CRC-8", 8, 0x07),
+        CrcConfig("CRC-8/MAXIM", 8, 0x31, 0x00, True, True, 0x00),
+        CrcConfig("CRC-16/XMODEM", 16, 0x1021),
+        CrcConfig("CRC-16/CCITT-FALSE", 16, 0x1021, 0xFFFF),
+        CrcConfig("CRC-16/MODBUS", 16, 0x8005, 0xFFFF, True, True, 0x0000),
+        CrcConfig("CRC-32", 32, 0x04C11DB7, 0xFFFFFFFF, True, True, 0xFFFFFFFF),
+        CrcConfig("CRC-32/MPEG-2", 32, 0x04C11DB7, 0xFFFFFFFF, False, False, 0x00000000),
+    )
+}
+
+_NP_DTYPES = {8: np.uint8, 16: np.uint16, 32: np.uint32}
+
+# 数据不少于该字节数时使用向量化的分通道计算，否则逐字节查表开销更小
+_BULK_THRESHOLD = 1 << 14
+# 分通道计算时的最大通道数和每条通道的最少字节数
+_MAX_LANES = 1 << 16
+_MIN_LANE_BYTES = 64
+
+
+def _reflect(value: int, width: int) -> int:
+    """
+    将 value 的低 width 位按位反转。
+    """
+    result = 0
+    for _ in range(width):
+        result = (result << 1) | (value & 1)
+        value >>= 1
+    return result
+
+
+@lru_cache(maxsize=None)
+def _crc_table(width: int, poly: int, reflected: bool) -> Tuple[int, ...]:
+    """
+    生成并缓存 256 项 CRC 查找表。
+
+    反射模式下使用反转后的多项式按低位优先计算，
+    因此查表时无需再逐字节反转输入。
+    """
+    mask = (1 << width) - 1
+    table = []
+    if reflected:
+        rpoly = _reflect(poly, width)
+        for byte in range(256):
+            crc = byte
+            for _ in range(8):
+                crc = (crc >> 1) ^ rpoly if crc & 1 else crc >> 1
+            table.append(crc)
+    else:
+        top = 1 << (width - 1)
+        for byte in range(256):
+            crc = byte << (width - 8)
+            for _ in range(8):
+                crc = ((crc << 1) ^ poly) if crc & top else (crc << 1)
+            table.append(crc & mask)
+    return tuple(table)
+
+
+@lru_cache(maxsize=None)
+def _crc_table_np(width: int, poly: int, reflected: bool) -> np.ndarray:
+    """
+    返回 NumPy 版本的查找表，供批量逐字计算使用。
+    """
+    return np.array(_crc_table(width, poly, reflected), dtype=_NP_DTYPES[width])
+
+
+def _step(reg: np.ndarray, byte: np.ndarray, table: np.ndarray, width: int, reflected: bool) -> np.ndarray:
+    """
+    对整个数组做一次逐字节查表更新。
+    """
+    dtype = table.dtype.type
+    if reflected:
+        idx = (reg ^ byte) & dtype(0xFF)
+        return (reg >> dtype(8)) ^ table[idx] if width > 8 else table[idx]
+    idx = ((reg >> dtype(width - 8)) ^ byte) & dtype(0xFF)
+    return (reg << dtype(8)) ^ table[idx] if width > 8 else table[idx]
+
+
+# 以下把"寄存器跨过若干个零字节"表示为 GF(2) 上的线性算子：
+# 算子是 width 个整数组成的元组，第 i 项为比特 i 单独置位时的结果。
+
+def _apply_operator(operator: Tuple[int, ...], value: int) -> int:
+    result = 0
+    bit = 0
+    while value:
+        if value & 1:
+            result ^= operator[bit]
+        value >>= 1
+        bit += 1
+    return result
+
+
+def _compose_operators(second: Tuple[int, ...], first: Tuple[int, ...]) -> Tuple[int, ...]:
+    """
+    复合两个算子：先 first 后 second。
+    """
+    return tuple(_apply_operator(second, column) for column in first)
+
+
+@lru_cache(maxsize=None)
+def _zero_byte_operator(width: int, poly: int, reflected: bool) -> Tuple[int, ...]:
+    """
+    寄存器读入一个零字节的线性算子。
+    """
+    table = _crc_table(width, poly, reflected)
+    mask = (1 << width) - 1
+    columns = []
+    for bit in range(width):
+        reg = 1 << bit
+        if reflected:
+            reg = (reg >> 8) ^ table[reg & 0xFF]
+        else:
+            reg = ((reg << 8) & mask) ^ table[(reg >> (width - 8)) & 0xFF]
+        columns.append(reg)
+    return tuple(columns)
+
+
+def _zero_bytes_operator(width: int, poly: int, reflected: bool, count: int) -> Tuple[int, ...]:
+    """
+    寄存器读入 count 个零字节的线性算子（按平方倍增计算）。
+    """
+    result = tuple(1 << bit for bit in range(width))
+    power = _zero_byte_operator(width, poly, reflected)
+    while count:
+        if count & 1:
+            result = _compose_operators(power, result)
+        count >>= 1
+        if count:
+            power = _compose_operators(power, power)
+    return result
+
+
+def _operator_tables(operator: Tuple[int, ...], dtype) -> np.ndarray:
+    """
+    将算子展开为按字节查表的形式：tables[k][b] 为第 k 个字节取值 b 时的结果。
+    """
+    width = len(operator)
+    values = np.arange(256)
+    tables = np.zeros((width // 8, 256), dtype=dtype)
+    for bit, column in enumerate(operator):
+        tables[bit // 8] ^= np.where((values >> (bit % 8)) & 1, column, 0).astype(dtype)
+    return tables
+
+
+def _apply_operator_array(tables: np.ndarray, values: np.ndarray) -> np.ndarray:
+    dtype = values.dtype.type
+    result = np.zeros_like(values)
+    for k, table in enumerate(tables):
+        result ^= table[(values >> dtype(8 * k)) & dtype(0xFF)]
+    return result
+
+
+def _crc_bulk(data: np.ndarray, width: int, poly: int, reflected: bool) -> int:
+    """
+    以 0 为初值计算大块数据的 CRC 寄存器（未做输出处理）。
+
+    数据在前面补零后切成 lanes 条长为 length 的通道：初值为 0 时前导零字节不改变寄存器。
+    所有通道同时逐列查表，再逐层两两合并：左通道跨过右通道长度个零字节后与右通道异或。
+    """
+    dtype = _NP_DTYPES[width]
+    table = _crc_table_np(width, poly, reflected)
+    lanes = min(_MAX_LANES, 1 << ((len(data) // _MIN_LANE_BYTES).bit_length() - 1))
+    length = -(-len(data) // lanes)
+    padded = np.zeros(lanes * length, dtype=np.uint8)
+    padded[len(padded) - len(data):] = data
+    rows = padded.reshape(lanes, length)
+
+    reg = np.zeros(lanes, dtype=dtype)
+    for column in range(length):
+        reg = _step(reg, rows[:, column].astype(dtype), table, width, reflected)
+
+    operator = _zero_bytes_operator(width, poly, reflected, length)
+    while len(reg) > 1:
+        reg = _apply_operator_array(_operator_tables(operator, dtype), reg[0::2]) ^ reg[1::2]
+        operator = _compose_operators(operator, operator)
+    return int(reg[0])
+
+
+def _finalize(crc: int, cfg: CrcConfig) -> int:
+    # 反射查表得到的是低位优先的寄存器，ref_in 与 ref_out 不一致时需要再反转一次
+    if cfg.ref_in != cfg.ref_out:
+        crc = _reflect(crc, cfg.width)
+    return (crc ^ cfg.xor_out) & cfg.mask
+
+
+def crc(data: BytesLike, cfg: CrcConfig) -> int:
+    """
+    计算一段字节数据的 CRC。
+
+    对 CRC-32 与 CRC-16/XMODEM 使用标准库中的 C 实现；其余配置的小块数据
+    使用缓存的 256 项查找表逐字节计算，大块数据使用向量化的分通道计算。
+
+    Args:
+        data: 输入字节
+        cfg: CRC 参数配置
+
+    Returns:
+        CRC 结果
+    """
+    if cfg == CRC_PRESETS["CRC-32"]:
+        return zlib.crc32(data) & 0xFFFFFFFF
+    if cfg == CRC_PRESETS["CRC-16/XMODEM"]:
+        return binascii.crc_hqx(data, 0)
+
+    width = cfg.width
+    if len(data) >= _BULK_THRESHOLD:
+        # 寄存器初值的贡献等于初值跨过全部数据长度个零字节
+        init = _reflect(cfg.init, width) if cfg.ref_in else cfg.init
+        operator = _zero_bytes_operator(width, cfg.poly, cfg.ref_in, len(data))
+        reg = _apply_operator(operator, init) ^ _crc_bulk(
+            np.frombuffer(data, dtype=np.uint8), width, cfg.poly, cfg.ref_in)
+        return _finalize(reg, cfg)
+
+    table = _crc_table(width, cfg.poly, cfg.ref_in)
+    if cfg.ref_in:
+        reg = _reflect(cfg.init, width)
+        for b in bytes(data):
+            reg = (reg >> 8) ^ table[(reg ^ b) & 0xFF]
+    else:
+        mask = cfg.mask
+        shift = width - 8
+        reg = cfg.init
+        for b in bytes(data):
+            reg = ((reg << 8) & mask) ^ table[((reg >> shift) ^ b) & 0xFF]
+    return _finalize(reg, cfg)
+
+
+def value_to_bytes(value: int, byte_count: int = 8, byteorder: str = "big") -> bytes:
+    """
+    将寄存器值转换为定长字节序列。
+    """
+    return (value & ((1 << (8 * byte_count)) - 1)).to_bytes(byte_count, byteorder)
+
+
+def crc_value(value: int, cfg: CrcConfig, byte_count: int = 8, byteorder: str = "big") -> int:
+    """
+    计算单个寄存器值的 CRC。
+
+    Args:
+        value: 寄存器值
+        cfg: CRC 参数配置
+        byte_count: 参与计算的字节数
+        byteorder: 字节序，"big" 或 "little"
+
+    Returns:
+        CRC 结果
+    """
+    return crc(value_to_bytes(value, byte_count, byteorder), cfg)
+
+
+def crc_words(words: np.ndarray, cfg: CrcConfig, byte_count: int = 8, byteorder: str = "big") -> np.ndarray:
+    """
+    对跟踪中的每个字分别计算 CRC（批量向量化）。
+
+    各字之间互不依赖，因此按字节位置迭代 byte_count 次，
+    每次对整个数组做一次查表，代价与样本数线性相关且没有 Python 级循环。
+
+    Args:
+        words: 一维无符号整数数组
+        cfg: CRC 参数配置
+        byte_count: 每个字参与计算的字节数
+        byteorder: 字节序，"big" 或 "little"
+
+    Returns:
+        与 words 等长的 CRC 结果数组
+    """
+    words = np.asarray(words, dtype=np.uint64)
+    dtype = _NP_DTYPES[cfg.width]
+    table = _crc_table_np(cfg.width, cfg.poly, cfg.ref_in)
+    width = cfg.width
+
+    if byteorder == "big":
+        shifts = [8 * (byte_count - 1 - k) for k in range(byte_count)]
+    else:
+        shifts = [8 * k for k in range(byte_count)]
+
+    init = _reflect(cfg.init, width) if cfg.ref_in else cfg.init
+    reg = np.full(words.shape, init, dtype=dtype)
+    for shift in shifts:
+        byte = ((words >> np.uint64(shift)) & np.uint64(0xFF)).astype(dtype)
+        reg = _step(reg, byte, table, width, cfg.ref_in)
+
+    if cfg.ref_in != cfg.ref_out:
+        reg = _reflect_array(reg, width)
+    return reg ^ dtype(cfg.xor_out)
+
+
+def _reflect_array(values: np.ndarray, width: int) -> np.ndarray:
+    """
+    对数组中每个元素的低 width 位按位反转。
+    """
+    table = np.array([_reflect(b, 8) for b in range(256)], dtype=values.dtype)
+    result = np.zeros_like(values)
+    for k in range(width // 8):
+        byte = (values >> values.dtype.type(8 * k)) & values.dtype.type(0xFF)
+        result |= table[byte] << values.dtype.type(width - 8 - 8 * k)
+    return result
+
+
+def parity(value: int) -> int:
+    """
+    计算偶校验位：置位数为奇数时返回 1。
+    """
+    return bin(value).count("1") & 1
+
+
+def popcount(value: int) -> int:
+    """
+    计算置位（值为 1 的比特）数量。
+    """
+    return bin(value).count("1")
+
+
+def popcount_words(words: np.ndarray) -> np.ndarray:
+    """
+    对跟踪中的每个字计算置位数量（批量向量化）。
+    """
+    words = np.asarray(words, dtype=np.uint64)
+    return np.bitwise_count(words) if hasattr(np, "bitwise_count") else _popcount_swar(words)
+
+
+def _popcount_swar(words: np.ndarray) -> np.ndarray:
+    # 旧版 NumPy 没有 bitwise_count 时使用 SWAR 算法
+    x = words - ((words >> np.uint64(1)) & np.uint64(0x5555555555555555))
+    x = (x & np.uint64(0x3333333333333333)) + ((x >> np.uint64(2)) & np.uint64(0x3333333333333333))
+    x = (x + (x >> np.uint64(4))) & np.uint64(0x0F0F0F0F0F0F0F0F)
+    return ((x * np.uint64(0x0101010101010101)) >> np.uint64(56)).astype(np.uint8)
+
+
+def parity_words(words: np.ndarray) -> np.ndarray:
+    """
+    对跟踪中的每个字计算偶校验位（批量向量化）。
+    """
+    return (popcount_words(words) & 1).astype(np.uint8)
+
+
+def checksum8(data: BytesLike) -> int:
+    """
+    8 位累加和（所有字节相加后取低 8 位）。
+    """
+    return int(np.frombuffer(data, dtype=np.uint8).sum(dtype=np.uint64)) & 0xFF
+
+
+def checksum16(data: BytesLike) -> int:
+    """
+    16 位累加和（所有字节相加后取低 16 位）。
+    """
+    return int(np.frombuffer(data, dtype=np.uint8).sum(dtype=np.uint64)) & 0xFFFF
+
+
+def xor8(data: BytesLike) -> int:
+    """
+    8 位异或校验（所有字节依次异或）。
+    """
+    arr = np.frombuffer(data, dtype=np.uint8)
+    return int(np.bitwise_xor.reduce(arr)) if arr.size else 0
+
+
+def ones_complement16(data: BytesLike) -> int:
+    """
+    16 位反码和（Internet Checksum，RFC 1071）。
+    """
+    data = bytes(data)
+    if len(data) % 2:
+        data += b"\x00"
+    total = int(np.frombuffer(data, dtype=">u2").sum(dtype=np.uint64))
+    while total >> 16:
+        total = (total & 0xFFFF) + (total >> 16)
+    return (~total) & 0xFFFF
+
+
+def crc_range(data: BytesLike, start: int, end: int, cfg: CrcConfig) -> int:
+    """
+    计算转储数据中 [start, end) 区间的 CRC。
+    """
+    return crc(memoryview(data)[start:end], cfg)
+
+
+def range_checksums(data: BytesLike, start: int, end: int, cfg: CrcConfig) -> Dict[str, int]:
+    """
+    计算转储数据中 [start, end) 区间的 CRC 与各种校验和。
+
+    Args:
+        data: 转储数据（可为 mmap）
+        start: 区间起始偏移
+        end: 区间结束偏移（不含）
+        cfg: CRC 参数配置
+
+    Returns:
+        以 "crc"、"sum8"、"sum16"、"inet"、"xor8" 为键的结果字典
+
+    Raises:
+        ValueError: 区间超出数据范围
+    """
+    if not 0 <= start <= end <= len(data):
+        raise ValueError(f"区间 {start:#x}-{end:#x} 超出数据范围（共 {len(data):#x} 字节）")
+    result = {"crc": crc_range(data, start, end, cfg)}
+    # 用完后显式释放视图，调用方随后才能关闭 mmap
+    with memoryview(data) as whole, whole[start:end] as view:
+        result.update(
+            sum8=checksum8(view),
+            sum16=checksum16(view),
+            inet=ones_complement16(view),
+            xor8=xor8(view),
+        )
+    return result
+
+
+def export_word_checksums(words: np.ndarray, cfg: CrcConfig, path: str,
+                          byte_count: int = 8, chunk_size: int = 1 << 16) -> int:
+    """
+    对跟踪中的每个字计算 CRC、偶校验位与置位数，并导出为 CSV。
+
+    Args:
+        words: 一维无符号整数数组
+        cfg: CRC 参数配置
+        path: 导出文件路径
+        byte_count: 每个字参与计算的字节数
+        chunk_size: 每次格式化写入的行数
+
+    Returns:
+        偶校验位为 1（置位数为奇数）的字数
+    """
+    words = np.asarray(words, dtype=np.uint64)
+    crcs = crc_words(words, cfg, byte_count)
+    counts = popcount_words(words)
+    parities = parity_words(words)
+    digits = byte_count * 2
+    crc_digits = cfg.width // 4
+
+    with open(path, "w", encoding="utf-8", newline="") as stream:
+        stream.write("index,value,crc,parity,popcount\n")
+        for offset in range(0, len(words), chunk_size):
+            end = min(offset + chunk_size, len(words))
+            rows = zip(range(offset, end), words[offset:end].tolist(), crcs[offset:end].tolist(),
+                       parities[offset:end].tolist(), counts[offset:end].tolist())
+            stream.writelines(
+                f"{index},{value:0{digits}X},{crc_:0{crc_digits}X},{bit},{count}\n"
+                for index, value, crc_, bit, count in rows
+            )
+    return int(parities.sum(dtype=np.int64))
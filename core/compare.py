@@ -0,0 +1,213 @@
+"""
+比较模块 - 两个寄存器值的差异比较，以及采集跟踪与基准跟踪的批量比较
+
+批量比较按块进行向量化计算，内存占用只与块大小相关，
+可用于检查数千万个样本的回归采集数据。
+"""
+
+import bisect
+from dataclasses import dataclass, field
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+DEFAULT_CHUNK_SIZE = 1 << 20  # 每块样本数
+DEFAULT_MAX_RANGES = 10000  # 最多记录的不匹配区间数量
+
+
+def diff_bits(a: int, b: int, bit_count: int = 64) -> int:
+    """
+    计算两个值的差异比特掩码。
+
+    Args:
+        a: 值 A
+        b: 值 B
+        bit_count: 参与比较的比特数
+
+    Returns:
+        差异掩码，值为 1 的比特表示 A 与 B 在该位不同
+    """
+    return (a ^ b) & ((1 << bit_count) - 1)
+
+
+def diff_bit_indices(a: int, b: int, bit_count: int = 64) -> List[int]:
+    """
+    返回 A 与 B 不同的比特编号列表（从最低位 0 开始，升序）。
+    """
+    mask = diff_bits(a, b, bit_count)
+    return [bit for bit in range(bit_count) if (mask >> bit) & 1]
+
+
+@dataclass
+class TraceDiff:
+    """
+    跟踪比较结果。
+
+    Attributes:
+        sample_count: 参与比较的样本数（两条跟踪中较短的长度）
+        length_mismatch: 两条跟踪长度是否不同
+        first_divergence: 第一个不匹配样本的索引，完全一致时为 None
+        mismatch_count: 不匹配的样本数
+        bit_mismatch_counts: 每个比特的不匹配次数，下标为比特编号
+        mismatch_ranges: 不匹配样本区间列表，每项为 (起始索引, 结束索引)，左闭右开
+        ranges_truncated: 区间数量超过上限而被截断时为 True
+    """
+    sample_count: int
+    length_mismatch: bool
+    first_divergence: Optional[int]
+    mismatch_count: int
+    bit_mismatch_counts: np.ndarray
+    mismatch_ranges: List[Tuple[int, int]] = field(default_factory=list)
+    ranges_truncated: bool = False
+
+    @property
+    def identical(self) -> bool:
+        return self.mismatch_count == 0 and not self.length_mismatch
+
+    def next_mismatch(self, index: int) -> Optional[int]:
+        """
+        返回 index 之后下一个不匹配区间的起始索引，没有记录的区间时返回 None。
+        """
+        starts = [start for start, _ in self.mismatch_ranges]
+        position = bisect.bisect_right(starts, index)
+        return starts[position] if position < len(starts) else None
+
+    def summary(self, top_bits: int = 4) -> str:
+        """
+        生成便于显示的比较摘要。
+
+        Args:
+            top_bits: 列出不匹配次数最多的比特数
+        """
+        if self.identical:
+            return f"完全一致，共 {self.sample_count} 个样本"
+        lines = [
+            f"样本: {self.sample_count}，不匹配: {self.mismatch_count}"
+            f" ({self.mismatch_count / max(self.sample_count, 1):.2%})",
+        ]
+        if self.first_divergence is not None:
+            lines.append(f"首个差异: 样本 {self.first_divergence + 1}")
+        if self.length_mismatch:
+            lines.append("两条跟踪长度不同")
+        ranges = f"不匹配区间: {len(self.mismatch_ranges)}"
+        if self.ranges_truncated:
+            ranges += "（已截断）"
+        lines.append(ranges)
+        order = np.argsort(-self.bit_mismatch_counts, kind="stable")[:top_bits]
+        bits = [f"bit{bit}×{self.bit_mismatch_counts[bit]}" for bit in order.tolist()
+                if self.bit_mismatch_counts[bit]]
+        if bits:
+            lines.append("差异最多的比特: " + " ".join(bits))
+        return "\n".join(lines)
+
+
+def _bit_counts(xor: np.ndarray, bit_count: int) -> np.ndarray:
+    """
+    统计异或结果中每个比特被置位的次数。
+    """
+    # 按小端字节展开后，第 j 列正好对应比特 j
+    raw = xor.astype("<u8", copy=False).view(np.uint8).reshape(-1, 8)
+    bits = np.unpackbits(raw, axis=1, bitorder="little")[:, :bit_count]
+    return bits.sum(axis=0, dtype=np.int64)
+
+
+def compare_traces(captured: np.ndarray, golden: np.ndarray, bit_count: int = 64,
+                   chunk_size: int = DEFAULT_CHUNK_SIZE,
+                   max_ranges: int = DEFAULT_MAX_RANGES) -> TraceDiff:
+    """
+    比较采集跟踪与基准跟踪。
+
+    逐块计算异或，只对不匹配的样本展开比特统计，
+    并在块边界处合并跨块的不匹配区间。
+
+    Args:
+        captured: 采集到的跟踪（一维无符号整数数组，可为 np.memmap）
+        golden: 基准跟踪
+        bit_count: 参与比较的比特数
+        chunk_size: 每块样本数
+        max_ranges: 最多记录的不匹配区间数量
+
+    Returns:
+        比较结果
+    """
+    captured = np.asarray(captured)
+    golden = np.asarray(golden)
+    n = min(len(captured), len(golden))
+    mask = np.uint64((1 << bit_count) - 1)
+
+    first = None
+    mismatch_count = 0
+    bit_counts = np.zeros(bit_count, dtype=np.int64)
+    ranges: List[Tuple[int, int]] = []
+    truncated = False
+    open_start = None  # 上一块末尾尚未结束的区间起点
+
+    for offset in range(0, n, chunk_size):
+        end = min(offset + chunk_size, n)
+        xor = (captured[offset:end].astype(np.uint64, copy=False)
+               ^ golden[offset:end].astype(np.uint64, copy=False)) & mask
+        bad = xor != 0
+
+        count = int(np.count_nonzero(bad))
+        if count == 0:
+            if open_start is not None:
+                truncated = _append_range(ranges, (open_start, offset), max_ranges) or truncated
+                open_start = None
+            continue
+
+        mismatch_count += count
+        bit_counts += _bit_counts(xor[bad], bit_count)
+        if first is None:
+            first = offset + int(np.argmax(bad))
+        if truncated:
+            # 区间列表已满，后续只需统计数量
+            continue
+
+        # 用差分找出区间的起点和终点
+        edges = np.diff(bad.astype(np.int8), prepend=np.int8(0), append=np.int8(0))
+        starts = np.flatnonzero(edges == 1) + offset
+        stops = np.flatnonzero(edges == -1) + offset
+
+        if open_start is not None:
+            if starts[0] == offset:
+                starts[0] = open_start
+            else:
+                truncated = _append_range(ranges, (open_start, offset), max_ranges) or truncated
+            open_start = None
+
+        if stops[-1] == end and end < n:
+            open_start = int(starts[-1])
+            starts, stops = starts[:-1], stops[:-1]
+
+        room = max_ranges - len(ranges)
+        ranges.extend(zip(starts[:room].tolist(), stops[:room].tolist()))
+        if len(starts) > room:
+            truncated = True
+            open_start = None
+
+    if open_start is not None:
+        truncated = _append_range(ranges, (open_start, n), max_ranges) or truncated
+
+    length_mismatch = len(captured) != len(golden)
+    if first is None and length_mismatch:
+        first = n
+
+    return TraceDiff(
+        sample_count=n,
+        length_mismatch=length_mismatch,
+        first_divergence=first,
+        mismatch_count=mismatch_count,
+        bit_mismatch_counts=bit_counts,
+        mismatch_ranges=ranges,
+        ranges_truncated=truncated,
+    )
+
+
+def _append_range(ranges: List[Tuple[int, int]], item: Tuple[int, int], max_ranges: int) -> bool:
+    """
+    追加一个区间，超过上限时丢弃并返回 True。
+    """
+    if len(ranges) >= max_ranges:
+        return True
+    ranges.append(item)
+    return False
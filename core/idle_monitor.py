@@ -0,0 +1,139 @@
+"""
+空闲监测模块 - 统计一段时间内的定时器唤醒次数和 CPU 占用
+
+通过应用程序级事件过滤器统计 Qt 定时器事件，并用进程 CPU 时间
+（以及可用时的上下文切换次数）衡量空闲时的资源消耗。
+"""
+
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Dict, Optional
+
+from PyQt5.QtCore import QCoreApplication, QEvent, QObject, QTimer, pyqtSignal
+
+try:
+    import resource
+except ImportError:  # Windows 没有 resource 模块
+    resource = None
+
+
+@dataclass
+class IdleReport:
+    """
+    空闲监测结果。
+
+    Attributes:
+        duration: 监测时长（秒）
+        timer_events: Qt 定时器事件次数
+        total_events: 全部 Qt 事件次数
+        cpu_seconds: 进程消耗的 CPU 时间（秒）
+        context_switches: 进程上下文切换次数，平台不支持时为 None
+        timer_sources: 各类对象收到的定时器事件次数
+    """
+    duration: float
+    timer_events: int
+    total_events: int
+    cpu_seconds: float
+    context_switches: Optional[int] = None
+    timer_sources: Dict[str, int] = field(default_factory=dict)
+
+    @property
+    def wakeups_per_second(self) -> float:
+        return self.timer_events / self.duration if self.duration else 0.0
+
+    @property
+    def cpu_percent(self) -> float:
+        return 100.0 * self.cpu_seconds / self.duration if self.duration else 0.0
+
+    def summary(self) -> str:
+        """
+        生成便于打印的统计摘要。
+        """
+        lines = [
+            f"时长: {self.duration:.1f}s",
+            f"定时器唤醒: {self.timer_events} 次 ({self.wakeups_per_second:.2f}/s)",
+            f"事件总数: {self.total_events}",
+            f"CPU: {self.cpu_seconds:.3f}s ({self.cpu_percent:.2f}%)",
+        ]
+        if self.context_switches is not None:
+            lines.append(f"上下文切换: {self.context_switches}")
+        for name, count in sorted(self.timer_sources.items(), key=lambda item: -item[1]):
+            lines.append(f"  {name}: {count}")
+        return "\n".join(lines)
+
+
+def _context_switches() -> Optional[int]:
+    if resource is None:
+        return None
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    return usage.ru_nvcsw + usage.ru_nivcsw
+
+
+class IdleMonitor(QObject):
+    """
+    空闲监测器。start() 后安装事件过滤器开始计数，
+    stop() 时移除过滤器并返回统计结果；也可用 measure() 定时测量。
+    """
+    finished = pyqtSignal(object)
+
+    def __init__(self, parent: Optional[QObject] = None):
+        super().__init__(parent)
+        self._timer_sources = Counter()
+        self._total_events = 0
+        self._running = False
+        self._start_wall = 0.0
+        self._start_cpu = 0.0
+        self._start_switches = None
+
+    def start(self) -> None:
+        """
+        开始监测。
+        """
+        if self._running:
+            return
+        self._timer_sources.clear()
+        self._total_events = 0
+        self._start_wall = time.perf_counter()
+        self._start_cpu = time.process_time()
+        self._start_switches = _context_switches()
+        QCoreApplication.instance().installEventFilter(self)
+        self._running = True
+
+    def stop(self) -> IdleReport:
+        """
+        停止监测并返回统计结果。
+        """
+        if self._running:
+            QCoreApplication.instance().removeEventFilter(self)
+            self._running = False
+
+        switches = _context_switches()
+        if switches is not None and self._start_switches is not None:
+            switches -= self._start_switches
+        else:
+            switches = None
+
+        return IdleReport(
+            duration=time.perf_counter() - self._start_wall,
+            timer_events=sum(self._timer_sources.values()),
+            total_events=self._total_events,
+            cpu_seconds=time.process_time() - self._start_cpu,
+            context_switches=switches,
+            timer_sources=dict(self._timer_sources),
+        )
+
+    def measure(self, seconds: float) -> None:
+        """
+        测量指定时长，结束后通过 finished 信号发出 IdleReport。
+
+        结束测量的单次定时器本身也会产生一次定时器事件。
+        """
+        self.start()
+        QTimer.singleShot(int(seconds * 1000), lambda: self.finished.emit(self.stop()))
+
+    def eventFilter(self, obj: QObject, event: QEvent) -> bool:
+        self._total_events += 1
+        if event.type() == QEvent.Timer:
+            self._timer_sources[type(obj).__name__] += 1
+        return False
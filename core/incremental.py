@@ -0,0 +1,112 @@
+"""
+增量解析模块 - 结果输入框的增量数值解析
+
+对于二进制和十六进制，每个数字对应固定的比特段，编辑后只需重新解析
+新旧文本之间发生变化的那一段数字，其余部分直接由上一次的结果移位拼接得到。
+"""
+
+from typing import Optional
+
+# 每个数字对应的比特数，只有 2 的幂进制才能按段拼接
+_DIGIT_BITS = {2: 1, 16: 4}
+
+
+def _common_prefix_len(a: str, b: str) -> int:
+    """
+    计算两个字符串的公共前缀长度。
+
+    通过对切片比较做二分查找，比较操作在 C 层完成，长文本下远快于逐字符循环。
+    """
+    lo, hi = 0, min(len(a), len(b))
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if a[:mid] == b[:mid]:
+            lo = mid
+        else:
+            hi = mid - 1
+    return lo
+
+
+def _common_suffix_len(a: str, b: str, limit: int) -> int:
+    """
+    计算两个字符串的公共后缀长度，不超过 limit。
+    """
+    lo, hi = 0, limit
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if a[len(a) - mid:] == b[len(b) - mid:]:
+            lo = mid
+        else:
+            hi = mid - 1
+    return lo
+
+
+class IncrementalParser:
+    """
+    记住上一次解析的文本和结果，新文本只重新解析发生变化的数字。
+    """
+
+    def __init__(self, base: int = 16):
+        self.base = base
+        self.text = ""
+        self.value = 0
+
+    def reset(self, text: str = "", value: Optional[int] = None) -> None:
+        """
+        重置解析状态。
+
+        Args:
+            text: 当前文本
+            value: text 对应的数值；为 None 时重新解析 text
+        """
+        if value is None:
+            value = int(text, self.base) if text else 0
+        self.text = text
+        self.value = value
+
+    def set_base(self, base: int) -> None:
+        """
+        切换进制并清空解析状态。
+        """
+        self.base = base
+        self.reset()
+
+    def parse(self, text: str) -> int:
+        """
+        解析文本。
+
+        Args:
+            text: 新的输入文本
+
+        Returns:
+            文本对应的整数值
+
+        Raises:
+            ValueError: 文本不是当前进制下的合法数值
+        """
+        if text == self.text:
+            return self.value
+
+        bits = _DIGIT_BITS.get(self.base)
+        if bits is None or not self.text or not text:
+            value = int(text, self.base) if text else 0
+        else:
+            value = self._splice(text, bits)
+
+        self.text = text
+        self.value = value
+        return value
+
+    def _splice(self, text: str, bits: int) -> int:
+        """
+        新文本 = 公共前缀 + 变化段 + 公共后缀，只解析变化段。
+        """
+        old = self.text
+        prefix = _common_prefix_len(old, text)
+        suffix = _common_suffix_len(old, text, min(len(old), len(text)) - prefix)
+        middle = text[prefix:len(text) - suffix]
+
+        high = self.value >> (bits * (len(old) - prefix))
+        low = self.value & ((1 << (bits * suffix)) - 1)
+        mid = int(middle, self.base) if middle else 0
+        return (((high << (bits * len(middle))) | mid) << (bits * suffix)) | low
@@ -0,0 +1,231 @@
+"""
+寄存器库模块 - 用 SQLite 保存命名的寄存器值与快照
+
+除原始值外，每条记录还保存 16 个半字节（nibble）列并分别建立索引，
+按位段查询（例如 "bits [15:12] == 0xA"）时可以直接走索引，无需全表扫描。
+数据库使用 WAL 模式，批量写入在同一事务中完成。
+"""
+
+import sqlite3
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, List, Optional, Tuple, Union
+
+NIBBLE_COUNT = 16  # 64 位值的半字节数
+_VALUE_MASK = (1 << 64) - 1
+
+_NIBBLE_COLUMNS = [f"n{k}" for k in range(NIBBLE_COUNT)]
+
+_SCHEMA = [
+    """
+    CREATE TABLE IF NOT EXISTS registers (
+        id INTEGER PRIMARY KEY,
+        device TEXT NOT NULL DEFAULT '',
+        name TEXT NOT NULL,
+        value INTEGER NOT NULL,
+        timestamp REAL NOT NULL,
+        notes TEXT NOT NULL DEFAULT '',
+        {nibbles}
+    )
+    """.format(nibbles=",\n        ".join(f"{c} INTEGER NOT NULL" for c in _NIBBLE_COLUMNS)),
+    "CREATE INDEX IF NOT EXISTS idx_registers_name ON registers(name)",
+    "CREATE INDEX IF NOT EXISTS idx_registers_device_name ON registers(device, name)",
+    "CREATE INDEX IF NOT EXISTS idx_registers_value ON registers(value)",
+] + [f"CREATE INDEX IF NOT EXISTS idx_registers_{c} ON registers({c})" for c in _NIBBLE_COLUMNS]
+
+
+@dataclass
+class RegisterEntry:
+    """
+    寄存器库中的一条记录。
+
+    Attributes:
+        device: 设备名
+        name: 寄存器名
+        value: 寄存器值（无符号 64 位）
+        timestamp: 保存时间（Unix 时间戳）
+        notes: 备注
+        id: 数据库中的行号，尚未保存时为 None
+    """
+    device: str
+    name: str
+    value: int
+    timestamp: float = 0.0
+    notes: str = ""
+    id: Optional[int] = None
+
+
+def _to_signed(value: int) -> int:
+    # SQLite 的 INTEGER 为有符号 64 位，按补码存储无符号值
+    value &= _VALUE_MASK
+    return value - (1 << 64) if value >> 63 else value
+
+
+def _to_unsigned(value: int) -> int:
+    return value & _VALUE_MASK
+
+
+def field_mask(high: int, low: int) -> int:
+    """
+    生成位段 [high:low] 的掩码。
+    """
+    return ((1 << (high - low + 1)) - 1) << low
+
+
+def _prefix_upper_bound(prefix: str) -> Optional[str]:
+    """
+    返回大于所有以 prefix 开头的字符串的最小字符串，用于把前缀查询转换为索引范围查询。
+    """
+    while prefix:
+        last = ord(prefix[-1])
+        if last < 0x10FFFF:
+            return prefix[:-1] + chr(last + 1)
+        prefix = prefix[:-1]
+    return None
+
+
+class RegisterLibrary:
+    """
+    寄存器库，封装 SQLite 数据库的读写和查询。
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        if str(path) != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.connection = sqlite3.connect(str(path))
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        with self.connection:
+            for statement in _SCHEMA:
+                self.connection.execute(statement)
+
+    def close(self) -> None:
+        self.connection.close()
+
+    def add(self, entry: RegisterEntry) -> int:
+        """
+        保存一条记录。
+
+        Returns:
+            新记录的行号
+        """
+        with self.connection:
+            cursor = self.connection.execute(self._insert_sql(), self._row(entry))
+        entry.id = cursor.lastrowid
+        return entry.id
+
+    def add_many(self, entries: Iterable[RegisterEntry]) -> int:
+        """
+        在同一个事务中批量保存记录。
+
+        Returns:
+            保存的记录数
+        """
+        rows = [self._row(entry) for entry in entries]
+        with self.connection:
+            self.connection.executemany(self._insert_sql(), rows)
+        return len(rows)
+
+    def delete(self, entry_id: int) -> None:
+        with self.connection:
+            self.connection.execute("DELETE FROM registers WHERE id = ?", (entry_id,))
+
+    def count(self) -> int:
+        return self.connection.execute("SELECT COUNT(*) FROM registers").fetchone()[0]
+
+    def search(self, name_prefix: str = "", device: Optional[str] = None,
+               mask: int = 0, expected: int = 0, limit: int = 200) -> List[RegisterEntry]:
+        """
+        按名称前缀、设备和掩码值查询记录，结果按时间倒序。
+
+        掩码查询会挑选掩码覆盖的最具选择性的半字节列作为索引条件，
+        再用 (value & mask) = expected 精确过滤。
+
+        Args:
+            name_prefix: 寄存器名前缀，为空时不限制
+            device: 设备名，为 None 时不限制
+            mask: 要比较的比特掩码，为 0 时不按值过滤
+            expected: 掩码内期望的值（已对齐到掩码位置）
+            limit: 最多返回的记录数
+
+        Returns:
+            匹配的记录列表
+        """
+        conditions = []
+        params = []
+
+        if name_prefix:
+            conditions.append("name >= ?")
+            params.append(name_prefix)
+            upper = _prefix_upper_bound(name_prefix)
+            if upper is not None:
+                conditions.append("name < ?")
+                params.append(upper)
+
+        if device is not None:
+            conditions.append("device = ?")
+            params.append(device)
+
+        mask &= _VALUE_MASK
+        if mask:
+            expected &= mask
+            nibble = self._nibble_condition(mask, expected)
+            if nibble is None:
+                return []
+            column, allowed = nibble
+            conditions.append(f"{column} IN ({', '.join('?' * len(allowed))})")
+            params.extend(allowed)
+            conditions.append("(value & ?) = ?")
+            params.extend([_to_signed(mask), _to_signed(expected)])
+
+        sql = "SELECT id, device, name, value, timestamp, notes FROM registers"
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        sql += " ORDER BY timestamp DESC LIMIT ?"
+        params.append(limit)
+
+        return [
+            RegisterEntry(device=device_, name=name, value=_to_unsigned(value),
+                          timestamp=timestamp, notes=notes, id=entry_id)
+            for entry_id, device_, name, value, timestamp, notes in self.connection.execute(sql, params)
+        ]
+
+    def search_field(self, high: int, low: int, field_value: int, **kwargs) -> List[RegisterEntry]:
+        """
+        查询位段 [high:low] 等于 field_value 的记录，其余参数同 search。
+        """
+        return self.search(mask=field_mask(high, low), expected=field_value << low, **kwargs)
+
+    @staticmethod
+    def _nibble_condition(mask: int, expected: int) -> Optional[Tuple[str, List[int]]]:
+        """
+        在掩码覆盖的半字节中选出允许取值最少的一个。
+
+        Returns:
+            (列名, 允许的半字节取值列表)；没有任何取值能满足时返回 None
+        """
+        best = None
+        for k in range(NIBBLE_COUNT):
+            nibble_mask = (mask >> (4 * k)) & 0xF
+            if not nibble_mask:
+                continue
+            nibble_expected = (expected >> (4 * k)) & 0xF
+            allowed = [x for x in range(16) if x & nibble_mask == nibble_expected]
+            if not allowed:
+                return None
+            if best is None or len(allowed) < len(best[1]):
+                best = (_NIBBLE_COLUMNS[k], allowed)
+        return best
+
+    @staticmethod
+    def _insert_sql() -> str:
+        columns = ["device", "name", "value", "timestamp", "notes"] + _NIBBLE_COLUMNS
+        return f"INSERT INTO registers ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})"
+
+    @staticmethod
+    def _row(entry: RegisterEntry) -> tuple:
+        value = entry.value & _VALUE_MASK
+        timestamp = entry.timestamp or time.time()
+        nibbles = tuple((value >> (4 * k)) & 0xF for k in range(NIBBLE_COUNT))
+        return (entry.device, entry.name, _to_signed(value), timestamp, entry.notes) + nibbles
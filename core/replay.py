@@ -0,0 +1,420 @@
+"""
+回放模块 - 按操作日志（置位、清零、翻转、写入、移位）重建寄存器每一步的值
+
+每个操作都可以写成同一种变换 f(x) = (shift(x, s) & keep) ^ flip，
+两个这样的变换复合后仍是这种形式，复合满足结合律，因此可以对整个日志做
+向量化的前缀扫描（associative scan），不需要逐条操作的 Python 循环。
+
+日志按固定间隔分块：先把每块归约为一个变换，再对块变换做前缀扫描得到
+每块起点的检查点值。查询任意位置的值时只需对所在的一块做扫描。
+"""
+
+import re
+from typing import Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+
+from config import IMPORT_BLOCK_SIZE, MAX_BIT_COUNT, MAX_SHIFT_VALUE, REPLAY_CHECKPOINT_INTERVAL
+from core.trace_import import Trace, hex_tokens_to_array, iter_blocks
+
+OP_SET = 0  # x | operand
+OP_CLEAR = 1  # x & ~operand
+OP_TOGGLE = 2  # x ^ operand
+OP_WRITE = 3  # operand
+OP_SHL = 4  # x << operand
+OP_SHR = 5  # x >> operand
+OP_AND = 6  # x & operand
+
+FORMAT_REPLAY = "replay"
+
+# 日志中的操作名，or/xor 分别是 set/toggle 的别名
+_OP_NAMES = {
+    b"set": OP_SET, b"or": OP_SET,
+    b"clear": OP_CLEAR,
+    b"toggle": OP_TOGGLE, b"xor": OP_TOGGLE,
+    b"write": OP_WRITE,
+    b"shl": OP_SHL,
+    b"shr": OP_SHR,
+    b"and": OP_AND,
+}
+
+_OP_KEYS = [(np.frombuffer(name.ljust(8, b"\0"), dtype=np.uint64)[0], kind) for name, kind in _OP_NAMES.items()]
+
+# 每行：可选的 "时间戳:" 前缀、操作名、操作数；掩码和写入值为十六进制（可带 0x），
+# 移位量不带 0x 时按十进制、带 0x 时按十六进制解析
+_OP_LINE = re.compile(
+    rb"^[ \t\[]*(?:(\d+(?:\.\d*)?)[\]]?[ \t]*:?[ \t]+)?("
+    + b"|".join(sorted(_OP_NAMES, key=len, reverse=True))
+    + rb")[ \t]+((?:0[xX])?[0-9a-fA-F]{1,16})\b",
+    re.M | re.I,
+)
+# 快速路径中时间戳（去掉方括号和冒号后）的格式，与 _OP_LINE 中的时间戳一致
+_STAMP = re.compile(rb"\d+(?:\.\d*)?")
+# 快速路径中操作数允许的字符：十六进制数字、0x 前缀中的 x，以及定长数组的填充 \0
+_OPERAND_VALID = np.zeros(256, dtype=bool)
+for _c in b"0123456789abcdefABCDEFxX\0":
+    _OPERAND_VALID[_c] = True
+
+
+def is_op_log(sample: Union[str, bytes]) -> bool:
+    """
+    判断文本开头是否为操作日志。
+    """
+    if isinstance(sample, str):
+        sample = sample.encode("utf-8", errors="replace")
+    return _OP_LINE.search(sample) is not None
+
+
+def _full_mask(width: int) -> np.uint64:
+    return np.uint64((1 << width) - 1)
+
+
+def _shift(x: np.ndarray, s: np.ndarray, full: np.uint64) -> np.ndarray:
+    """
+    按 s 的符号左移（正）或右移（负），结果截断到寄存器宽度；移出 64 位时为 0。
+    """
+    amount = np.minimum(np.abs(s), 63).astype(np.uint64)
+    out = np.where(s >= 0, x << amount, x >> amount) & full
+    return np.where(np.abs(s) >= 64, np.uint64(0), out)
+
+
+def _compose(first: Tuple[np.ndarray, ...], second: Tuple[np.ndarray, ...],
+             full: np.uint64) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    复合两个变换：先 first 后 second。
+
+    second(first(x)) = (shift(x, s1 + s2) & shift(keep1, s2) & keep2)
+                       ^ ((shift(flip1, s2) & keep2) ^ flip2)
+    """
+    s1, keep1, flip1 = first
+    s2, keep2, flip2 = second
+    s = np.clip(s1 + s2, -64, 64)
+    keep = _shift(keep1, s2, full) & keep2
+    flip = (_shift(flip1, s2, full) & keep2) ^ flip2
+    return s, keep, flip
+
+
+def _apply(transform: Tuple[np.ndarray, ...], x: np.ndarray, full: np.uint64) -> np.ndarray:
+    s, keep, flip = transform
+    return (_shift(x, s, full) & keep) ^ flip
+
+
+def _scan(transform: Tuple[np.ndarray, ...], full: np.uint64) -> Tuple[np.ndarray, ...]:
+    """
+    沿最后一维做包含式前缀扫描（Hillis-Steele 倍增），返回每个位置之前（含）所有变换的复合。
+    """
+    s, keep, flip = (a.copy() for a in transform)
+    length = s.shape[-1]
+    step = 1
+    while step < length:
+        composed = _compose((s[..., :-step], keep[..., :-step], flip[..., :-step]),
+                            (s[..., step:], keep[..., step:], flip[..., step:]), full)
+        s[..., step:], keep[..., step:], flip[..., step:] = composed
+        step *= 2
+    return s, keep, flip
+
+
+def _reduce(transform: Tuple[np.ndarray, ...], full: np.uint64) -> Tuple[np.ndarray, ...]:
+    """
+    沿最后一维两两归约（长度须为 2 的幂），返回整行变换的复合。
+    """
+    s, keep, flip = transform
+    while s.shape[-1] > 1:
+        s, keep, flip = _compose((s[..., 0::2], keep[..., 0::2], flip[..., 0::2]),
+                                 (s[..., 1::2], keep[..., 1::2], flip[..., 1::2]), full)
+    return s[..., 0], keep[..., 0], flip[..., 0]
+
+
+def ops_to_transforms(kinds: np.ndarray, operands: np.ndarray,
+                      width: int = MAX_BIT_COUNT) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    将操作数组转换为变换数组 (移位量, 保留掩码, 异或掩码)。
+
+    Args:
+        kinds: 操作类型数组（OP_* 常量）
+        operands: 操作数数组，移位操作为移位量，其余为掩码或写入值
+        width: 寄存器宽度（比特数）
+
+    Raises:
+        ValueError: 存在未知的操作类型
+    """
+    kinds = np.asarray(kinds, dtype=np.int8)
+    operands = np.asarray(operands, dtype=np.uint64)
+    full = _full_mask(width)
+    if len(kinds) and (kinds.min() < OP_SET or kinds.max() > OP_AND):
+        raise ValueError("未知的操作类型")
+
+    masks = operands & full
+    amounts = np.minimum(operands, np.uint64(64)).astype(np.int64)
+    s = np.zeros(len(kinds), dtype=np.int64)
+    s[kinds == OP_SHL] = amounts[kinds == OP_SHL]
+    s[kinds == OP_SHR] = -amounts[kinds == OP_SHR]
+
+    # x | m = (x & ~m) ^ m，x & ~m = (x & ~m) ^ 0，x ^ m = (x & 全 1) ^ m，写入 v = (x & 0) ^ v
+    keep = np.select(
+        [(kinds == OP_SET) | (kinds == OP_CLEAR), kinds == OP_TOGGLE, kinds == OP_WRITE, kinds == OP_AND],
+        [~masks & full, np.full(len(kinds), full), np.zeros(len(kinds), dtype=np.uint64), masks],
+        default=_shift(np.full(len(kinds), full), s, full),
+    ).astype(np.uint64)
+    flip = np.where((kinds == OP_SET) | (kinds == OP_TOGGLE) | (kinds == OP_WRITE), masks, np.uint64(0))
+    return s, keep, flip.astype(np.uint64)
+
+
+class Replay:
+    """
+    操作日志的回放结果，提供与 Trace 相同的浏览接口（长度、sample、timestamps、source_format）。
+
+    构造时只计算每块起点的检查点值；任意位置的值按需对所在块做扫描，
+    最近访问的一块会被缓存，拖动滑块浏览时相邻位置直接命中缓存。
+    """
+    source_format = FORMAT_REPLAY
+
+    def __init__(self, kinds: np.ndarray, operands: np.ndarray, initial: int = 0,
+                 width: int = MAX_BIT_COUNT, timestamps: Optional[np.ndarray] = None,
+                 interval: int = REPLAY_CHECKPOINT_INTERVAL):
+        """
+        Args:
+            kinds: 操作类型数组（OP_* 常量）
+            operands: 操作数数组
+            initial: 第一个操作之前的寄存器值
+            width: 寄存器宽度（比特数）
+            timestamps: 每个操作的时间戳，没有时为 None
+            interval: 检查点间隔（操作数），须为 2 的幂
+        """
+        if interval < 1 or interval & (interval - 1):
+            raise ValueError("检查点间隔必须是 2 的幂")
+        self.full = _full_mask(width)
+        self.initial = np.uint64(initial & int(self.full))
+        self.timestamps = timestamps
+        self.interval = interval
+        self.length = len(kinds)
+
+        s, keep, flip = ops_to_transforms(kinds, operands, width)
+        # 末尾用恒等变换补齐到整块
+        pad = -self.length % interval
+        self.transforms = (
+            np.concatenate([s, np.zeros(pad, dtype=np.int64)]).astype(np.int8).reshape(-1, interval),
+            np.concatenate([keep, np.full(pad, self.full)]).reshape(-1, interval),
+            np.concatenate([flip, np.zeros(pad, dtype=np.uint64)]).reshape(-1, interval),
+        )
+
+        chunk = _reduce(self._block_transforms(), self.full)
+        prefix = _scan(chunk, self.full)
+        ends = _apply(prefix, np.full(len(prefix[0]), self.initial), self.full)
+        # checkpoints[c] 为第 c 块第一个操作之前的值
+        self.checkpoints = np.concatenate([[self.initial], ends[:-1]]).astype(np.uint64)
+        self._cached = (-1, None)
+
+    def __len__(self) -> int:
+        return self.length
+
+    def _block_transforms(self, block: Optional[int] = None) -> Tuple[np.ndarray, ...]:
+        s, keep, flip = self.transforms
+        if block is None:
+            return s.astype(np.int64), keep, flip
+        return s[block].astype(np.int64), keep[block], flip[block]
+
+    def state_at(self, index: int) -> int:
+        """
+        返回执行完第 index 个操作（从 0 开始）之后的寄存器值。
+        """
+        if not 0 <= index < self.length:
+            raise IndexError("操作序号超出范围")
+        block, offset = divmod(index, self.interval)
+        if self._cached[0] != block:
+            prefix = _scan(self._block_transforms(block), self.full)
+            states = _apply(prefix, np.full(self.interval, self.checkpoints[block]), self.full)
+            self._cached = (block, states)
+        return int(self._cached[1][offset])
+
+    def sample(self, index: int) -> int:
+        return self.state_at(index)
+
+    def states(self) -> np.ndarray:
+        """
+        一次性计算每个操作之后的寄存器值，所有块同时扫描。
+        """
+        prefix = _scan(self._block_transforms(), self.full)
+        states = _apply(prefix, self.checkpoints[:, None], self.full)
+        return states.reshape(-1)[:self.length]
+
+    @property
+    def final(self) -> int:
+        """
+        执行完全部操作后的寄存器值。
+        """
+        return self.state_at(self.length - 1) if self.length else int(self.initial)
+
+
+def trace_values(trace: Union[Trace, Replay]) -> np.ndarray:
+    """
+    返回跟踪的全部样本值；回放结果按需一次性计算每个操作之后的值。
+    """
+    return trace.states() if isinstance(trace, Replay) else trace.values
+
+
+def _split_op_block(block: bytes) -> Optional[Tuple[np.ndarray, np.ndarray, Optional[np.ndarray]]]:
+    """
+    快速路径：每行恰好是 "[时间戳] 操作名 操作数" 时，按空白切分后整体向量化识别。
+
+    Returns:
+        (操作类型数组, 操作数文本数组, 时间戳文本数组)；文本不满足上述格式时返回 None，由正则逐行解析
+    """
+    words = block.split()
+    if not words:
+        return np.zeros(0, dtype=np.int8), np.zeros(0, dtype="S1"), None
+    words = np.array(words)
+    if words.dtype.itemsize > 32:
+        return None
+
+    # 取每个词的前 8 个字节转为小写后当作一个 uint64 比较，操作名都不超过 8 个字符
+    chars = words.view(np.uint8).reshape(len(words), -1)
+    head = np.zeros((len(words), 8), dtype=np.uint8)
+    head[:, :min(8, chars.shape[1])] = chars[:, :8]
+    head |= ((head >= ord("A")) & (head <= ord("Z"))).view(np.uint8) << 5
+    keys = head.view(np.uint64).reshape(-1)
+    codes = np.full(len(words), -1, dtype=np.int8)
+    for key, kind in _OP_KEYS:
+        codes[keys == key] = kind
+
+    # 每行一个操作，每个操作后面紧跟操作数，前面最多有一个时间戳
+    positions = np.flatnonzero(codes >= 0)
+    lines = block.count(b"\n") + (not block.endswith(b"\n"))
+    if len(positions) != lines or positions[-1] + 2 != len(words):
+        return None
+    lead = positions - np.concatenate([[0], positions[:-1] + 2])
+    if (lead > 1).any():
+        return None
+
+    operands = words[positions + 1]
+    chars = operands.view(np.uint8).reshape(len(operands), -1)
+    if not _OPERAND_VALID[chars].all():
+        return None
+    is_x = (chars | 0x20) == ord("x")
+    prefixed = is_x[:, 1] & (chars[:, 0] == ord("0")) if chars.shape[1] > 1 else np.zeros(len(chars), dtype=bool)
+    digits = np.count_nonzero(chars, axis=1) - 2 * prefixed
+    if (is_x.sum(axis=1) != prefixed).any() or (digits < 1).any() or (digits > 16).any():
+        return None
+
+    stamps = None
+    if lead.any():
+        stamped = [word.strip(b"[]:") for word in words[positions[lead == 1] - 1].tolist()]
+        # 行首不是时间戳（例如 "INFO set 0x2"）时交给正则，与正则路径一样跳过该行
+        if not all(_STAMP.fullmatch(word) for word in stamped):
+            return None
+        stamps = np.full(len(positions), b"", dtype="S32")
+        stamps[lead == 1] = stamped
+    return codes[positions], operands, stamps
+
+
+def _match_op_block(block: bytes) -> Tuple[np.ndarray, List[bytes], Optional[np.ndarray]]:
+    """
+    逐行用正则提取操作，跳过无法识别的行。
+    """
+    matches = _OP_LINE.findall(block)
+    if not matches:
+        return np.zeros(0, dtype=np.int8), [], None
+    stamps, names, tokens = zip(*matches)
+    kinds = np.array([_OP_NAMES[name.lower()] for name in names], dtype=np.int8)
+    return kinds, list(tokens), np.array(stamps, dtype="S32") if any(stamps) else None
+
+
+def _parse_op_block(block: bytes) -> Tuple[np.ndarray, np.ndarray, Optional[np.ndarray]]:
+    """
+    解析一块操作日志。
+
+    Returns:
+        (操作类型数组, 操作数数组, 时间戳数组)；时间戳缺失的项为 NaN，整块都没有时间戳时为 None
+
+    Raises:
+        ValueError: 移位量或时间戳无效
+    """
+    parsed = _split_op_block(block)
+    if parsed is None:
+        parsed = _match_op_block(block)
+    kinds, tokens, stamps = parsed
+    tokens = np.array(tokens, dtype="S18")
+    operands = hex_tokens_to_array(tokens)
+
+    shifts = (kinds == OP_SHL) | (kinds == OP_SHR)
+    if shifts.any():
+        chars = tokens.view(np.uint8).reshape(len(tokens), 18)
+        prefixed = (chars[:, 0] == ord("0")) & ((chars[:, 1] | 0x20) == ord("x"))
+        decimal = shifts & ~prefixed
+        if decimal.any():
+            # 不带 0x 的移位量按十进制书写，上面按十六进制解析的结果逐位换回十进制
+            coded = operands[decimal]
+            digits = [(coded >> np.uint64(4 * k)) & np.uint64(0xF) for k in range(16)]
+            if any((d > 9).any() for d in digits):
+                raise ValueError("移位量必须是十进制整数")
+            if any(d.any() for d in digits[3:]):
+                raise ValueError(f"移位量必须是0到{MAX_SHIFT_VALUE}之间的整数")
+            operands[decimal] = sum(d * np.uint64(10 ** k) for k, d in enumerate(digits[:3]))
+        if (operands[shifts] > MAX_SHIFT_VALUE).any():
+            raise ValueError(f"移位量必须是0到{MAX_SHIFT_VALUE}之间的整数")
+
+    timestamps = None
+    if stamps is not None:
+        stamps[stamps == b""] = b"nan"
+        timestamps = stamps.astype(np.float64)
+    return kinds, operands, timestamps
+
+
+def replay_blocks(blocks: Iterator[bytes], initial: int = 0, width: int = MAX_BIT_COUNT) -> Replay:
+    """
+    从文本块序列解析操作日志并回放。
+
+    Args:
+        blocks: 在换行处截断的文本块
+        initial: 第一个操作之前的寄存器值
+        width: 寄存器宽度（比特数）
+
+    Raises:
+        ValueError: 没有解析到任何操作或移位量无效
+    """
+    kinds: List[np.ndarray] = []
+    operands: List[np.ndarray] = []
+    stamps: List[Optional[np.ndarray]] = []
+    for block in blocks:
+        block_kinds, block_operands, block_stamps = _parse_op_block(block)
+        kinds.append(block_kinds)
+        operands.append(block_operands)
+        stamps.append(block_stamps)
+
+    if not sum(len(k) for k in kinds):
+        raise ValueError("没有解析到任何操作")
+    timestamps = None
+    if any(block is not None for block in stamps):
+        timestamps = np.concatenate([
+            block if block is not None else np.full(len(block_kinds), np.nan)
+            for block, block_kinds in zip(stamps, kinds)
+        ])
+    return Replay(np.concatenate(kinds), np.concatenate(operands), initial, width, timestamps)
+
+
+def replay_text(text: Union[str, bytes], initial: int = 0, width: int = MAX_BIT_COUNT,
+                block_size: int = IMPORT_BLOCK_SIZE) -> Replay:
+    """
+    从剪贴板等文本回放操作日志，参数含义同 replay_blocks。
+    """
+    if isinstance(text, str):
+        text = text.encode("utf-8", errors="replace")
+
+    def blocks() -> Iterator[bytes]:
+        start = 0
+        while start < len(text):
+            end = text.find(b"\n", start + block_size)
+            end = len(text) if end < 0 else end + 1
+            yield text[start:end]
+            start = end
+
+    return replay_blocks(blocks(), initial, width)
+
+
+def replay_file(path: str, initial: int = 0, width: int = MAX_BIT_COUNT,
+                block_size: int = IMPORT_BLOCK_SIZE) -> Replay:
+    """
+    从文件按块读取操作日志并回放，参数含义同 replay_blocks。
+    """
+    with open(path, "rb") as stream:
+        return replay_blocks(iter_blocks(stream, block_size), initial, width)
@@ -0,0 +1,170 @@
+"""
+单实例模块 - 通过本地套接字把再次启动时的参数转发给已运行的实例
+
+本模块只依赖 QtCore 和 QtNetwork，转发阶段无需导入界面组件，
+因此第二次启动可以在毫秒级内完成转发并退出。
+"""
+
+import argparse
+import getpass
+import json
+import os
+import tempfile
+from typing import List, Optional
+
+from PyQt5.QtCore import QLockFile, QObject, pyqtSignal
+from PyQt5.QtNetwork import QLocalServer, QLocalSocket
+
+from config import APP_ID, INSTANCE_CONNECT_TIMEOUT, INSTANCE_LOCK_TIMEOUT
+
+BASE_CHOICES = {"hex": 16, "dec": 10, "bin": 2}
+
+
+def server_name() -> str:
+    """
+    本地套接字名称，按用户区分，避免多用户环境下互相干扰。
+    """
+    try:
+        user = getpass.getuser()
+    except Exception:
+        user = "default"
+    return f"{APP_ID}-{user}"
+
+
+def parse_args(argv: List[str]) -> argparse.Namespace:
+    """
+    解析命令行参数。
+
+    Args:
+        argv: 不含程序名的参数列表
+
+    Returns:
+        解析结果
+    """
+    parser = argparse.ArgumentParser(description="数位分析器")
+    parser.add_argument("value", nargs="?", help="启动后显示的数值（按 --base 指定的进制解析）")
+    parser.add_argument("--base", choices=sorted(BASE_CHOICES), help="数值的进制")
+    parser.add_argument("--file", help="启动后导入的跟踪文件（xxd、hexdump -C、od 或日志）")
+    parser.add_argument("--prewarm", action="store_true", help="启动后隐藏到托盘，保持窗口预热")
+    parser.add_argument("--new-instance", action="store_true", help="不复用已运行的实例")
+    parser.add_argument("--low-power", action="store_true", help="低功耗模式，关闭 Mica 特效和动画")
+    parser.add_argument("--measure-idle", type=float, metavar="SECONDS",
+                        help="启动后统计指定秒数内的定时器唤醒次数和 CPU 占用")
+    # 忽略 Qt 自身的参数（如 -style）
+    args, _ = parser.parse_known_args(argv)
+    return args
+
+
+def args_to_message(args: argparse.Namespace) -> dict:
+    """
+    将命令行参数转换为转发给运行实例的消息。
+    """
+    return {
+        "value": args.value,
+        "base": args.base,
+        # 运行实例的工作目录可能不同，转发绝对路径
+        "file": os.path.abspath(args.file) if args.file else None,
+        "show": not args.prewarm,
+    }
+
+
+def send_message(message: dict, timeout: int = INSTANCE_CONNECT_TIMEOUT) -> bool:
+    """
+    尝试将消息发送给已运行的实例。
+
+    Args:
+        message: 要发送的消息
+        timeout: 连接和写入的超时时间（毫秒）
+
+    Returns:
+        发送成功返回 True；没有运行中的实例时返回 False
+    """
+    socket = QLocalSocket()
+    socket.connectToServer(server_name())
+    if not socket.waitForConnected(timeout):
+        return False
+
+    data = json.dumps(message).encode("utf-8") + b"\n"
+    ok = socket.write(data) == len(data)
+    if ok:
+        # flush 可能已经写完全部数据，此时 waitForBytesWritten 无数据可等会返回 False，
+        # 只有仍有待写数据时才等待
+        socket.flush()
+        ok = socket.bytesToWrite() == 0 or socket.waitForBytesWritten(timeout)
+    socket.disconnectFromServer()
+    if socket.state() != QLocalSocket.UnconnectedState:
+        socket.waitForDisconnected(timeout)
+    return ok
+
+
+class SingleInstanceServer(QObject):
+    """
+    运行实例一侧的本地套接字服务，收到消息后发射 messageReceived 信号。
+    """
+    messageReceived = pyqtSignal(dict)
+
+    def __init__(self, parent: Optional[QObject] = None):
+        super().__init__(parent)
+        self._server = QLocalServer(self)
+        self._server.newConnection.connect(self._on_new_connection)
+        self._buffers = {}
+
+    def listen(self) -> bool:
+        """
+        开始监听。
+
+        Qt 5 在 Unix 上会用新套接字覆盖同名的旧套接字，Windows 命名管道也允许多个服务端，
+        所以 listen() 本身发现不了正在监听的其他实例。这里用锁文件串行化"探测-监听"：
+        持锁后先连接一次，有实例应答则放弃；否则移除上次异常退出遗留的套接字文件后再监听。
+
+        Returns:
+            监听成功返回 True；已有其他实例在监听（或等不到锁）时返回 False
+        """
+        name = server_name()
+        lock = QLockFile(os.path.join(tempfile.gettempdir(), f"{name}.lock"))
+        if not lock.tryLock(INSTANCE_LOCK_TIMEOUT):
+            return False
+        try:
+            probe = QLocalSocket()
+            probe.connectToServer(name)
+            if probe.waitForConnected(INSTANCE_CONNECT_TIMEOUT):
+                probe.disconnectFromServer()
+                return False
+            QLocalServer.removeServer(name)
+            self._server.setSocketOptions(QLocalServer.UserAccessOption)
+            return self._server.listen(name)
+        finally:
+            lock.unlock()
+
+    def close(self) -> None:
+        """
+        停止监听。
+        """
+        self._server.close()
+
+    def _on_new_connection(self) -> None:
+        while self._server.hasPendingConnections():
+            socket = self._server.nextPendingConnection()
+            self._buffers[socket] = b""
+            socket.readyRead.connect(lambda s=socket: self._on_ready_read(s))
+            socket.disconnected.connect(lambda s=socket: self._on_disconnected(s))
+            if socket.bytesAvailable():
+                self._on_ready_read(socket)
+
+    def _on_ready_read(self, socket: QLocalSocket) -> None:
+        self._buffers[socket] += bytes(socket.readAll())
+        while b"\n" in self._buffers[socket]:
+            line, self._buffers[socket] = self._buffers[socket].split(b"\n", 1)
+            try:
+                message = json.loads(line.decode("utf-8"))
+            except ValueError:
+                continue
+            if isinstance(message, dict):
+                self.messageReceived.emit(message)
+
+    def _on_disconnected(self, socket: QLocalSocket) -> None:
+        # 客户端写完即断开，断开前可能还有未读取的数据
+        if socket in self._buffers and socket.bytesAvailable():
+            self._on_ready_read(socket)
+        self._buffers.pop(socket, None)
+        socket.deleteLater()
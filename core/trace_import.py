@@ -0,0 +1,524 @@
+"""
+跟踪导入模块 - 将 xxd、hexdump -C、od 输出或 "时间戳: 0x..." 日志文本导入为数值跟踪
+
+文本按块读取（每块在换行处截断），每块用预编译的正则一次性提取，
+再整体转换为 NumPy 数组，不对每个值调用 int(text, 16)。
+工作内存只与块大小相关，适合导入 GB 级的日志。
+"""
+
+import re
+from dataclasses import dataclass
+from typing import BinaryIO, Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+
+from config import IMPORT_BLOCK_SIZE, IMPORT_BYTE_ORDER, IMPORT_WORD_BYTES
+
+FORMAT_XXD = "xxd"
+FORMAT_HEXDUMP = "hexdump"
+FORMAT_OD = "od"
+FORMAT_LOG = "log"
+FORMATS = (FORMAT_XXD, FORMAT_HEXDUMP, FORMAT_OD, FORMAT_LOG)
+
+# xxd：偏移后跟冒号，十六进制分组之间用单个空格分隔，与 ASCII 列之间至少两个空格
+_XXD_LINE = re.compile(rb"^[0-9a-fA-F]+: ((?:[0-9a-fA-F]{2,32} )*[0-9a-fA-F]{0,32})", re.M)
+# hexdump -C：偏移后跟逐字节的十六进制（第 8 字节后多一个空格），以 |ASCII| 结尾
+_HEXDUMP_LINE = re.compile(rb"^([0-9a-fA-F]{8,})((?: {1,2}[0-9a-fA-F]{2}){0,16})[ \t\r]*(?:\|.*)?$|^(\*)[ \t\r]*$", re.M)
+# od：偏移后跟空白分隔的数据项，-t ...z 时以 >ASCII< 结尾
+_OD_LINE = re.compile(rb"^([0-9a-fA-F]{6,})((?:[ \t]+[0-9a-fA-F]+)*)[ \t\r]*(?:>.*)?$|^(\*)[ \t\r]*$", re.M)
+# 日志行首时间戳之前允许跳过的空白和括号字符数，以及时间戳的最大长度
+_STAMP_LEAD = 4
+_STAMP_WIDTH = 24
+
+_DETECT = (
+    (FORMAT_HEXDUMP, re.compile(rb"^[0-9a-fA-F]{8,}  (?:[0-9a-fA-F]{2} {1,2}){1,16}.*\|", re.M)),
+    (FORMAT_XXD, re.compile(rb"^[0-9a-fA-F]{6,}: [0-9a-fA-F]{2,}", re.M)),
+    (FORMAT_OD, re.compile(rb"^[0-7]{7} [0-7]{6}(?: [0-7]{6})*\r?$|^[0-9a-fA-F]{6,7}(?: [0-9a-fA-F]{2,16})+(?:  +>.*<)?\r?$", re.M)),
+    (FORMAT_LOG, re.compile(rb"0[xX][0-9a-fA-F]+")),
+)
+
+# 十六进制字符到数值的查找表，非十六进制字符（包括填充的 \0）为 0
+_HEX_LUT = np.zeros(256, dtype=np.uint64)
+# 同一张表的有效性标记，非十六进制字符为 False
+_HEX_VALID = np.zeros(256, dtype=bool)
+for _c in b"0123456789":
+    _HEX_LUT[_c] = _c - ord("0")
+for _c in b"abcdef":
+    _HEX_LUT[_c] = _c - ord("a") + 10
+    _HEX_LUT[_c - 32] = _c - ord("a") + 10
+for _c in b"0123456789abcdefABCDEF":
+    _HEX_VALID[_c] = True
+# 十进制时间戳允许的字符
+_NUMERIC_VALID = np.zeros(256, dtype=bool)
+for _c in b"0123456789.":
+    _NUMERIC_VALID[_c] = True
+
+
+@dataclass
+class Trace:
+    """
+    导入得到的数值跟踪。
+
+    Attributes:
+        values: 样本值数组（uint64）
+        timestamps: 每个样本的时间戳，日志中没有时间戳时为 None
+        source_format: 导入时识别或指定的格式
+    """
+    values: np.ndarray
+    timestamps: Optional[np.ndarray] = None
+    source_format: str = ""
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def sample(self, index: int) -> int:
+        """
+        返回第 index 个样本的值。
+        """
+        return int(self.values[index])
+
+
+def detect_format(sample: bytes) -> str:
+    """
+    根据文本开头的内容识别格式。
+
+    Args:
+        sample: 文本开头的若干字节
+
+    Returns:
+        格式名称
+
+    Raises:
+        ValueError: 无法识别格式
+    """
+    for name, pattern in _DETECT:
+        if pattern.search(sample):
+            return name
+    raise ValueError("无法识别的导入格式")
+
+
+def hex_tokens_to_array(tokens: Union[List[bytes], np.ndarray]) -> np.ndarray:
+    """
+    将不超过 16 位的十六进制文本（可带 0x 前缀）批量转换为 uint64 数组。
+
+    先构造定长字节数组，再按长度分组逐列查表累加，全程没有 Python 级的逐值循环。
+    前缀中的 "x" 在查表时与前导 0 一样按 0 处理，不需要单独去除。
+
+    Raises:
+        ValueError: 存在超过 16 位的数值
+    """
+    if not len(tokens):
+        return np.zeros(0, dtype=np.uint64)
+    fixed = np.array(tokens, dtype=np.bytes_)
+    chars = fixed.view(np.uint8).reshape(len(fixed), -1)
+    lengths = np.count_nonzero(chars, axis=1)
+    if chars.shape[1] > 1:
+        prefixed = (chars[:, 0] == ord("0")) & ((chars[:, 1] | 0x20) == ord("x"))
+        if (lengths - 2 * prefixed > 16).any():
+            raise ValueError("数值超过 16 位十六进制")
+    values = np.zeros(len(fixed), dtype=np.uint64)
+    four = np.uint64(4)
+    for length in np.unique(lengths).tolist():
+        rows = np.flatnonzero(lengths == length)
+        group_chars = chars[rows]
+        group = np.zeros(len(rows), dtype=np.uint64)
+        for column in range(length):
+            group = (group << four) | _HEX_LUT[group_chars[:, column]]
+        values[rows] = group
+    return values
+
+
+def iter_blocks(stream: BinaryIO, block_size: int = IMPORT_BLOCK_SIZE) -> Iterator[bytes]:
+    """
+    按块读取文本，每块都在换行处截断，保证不会把一行拆到两块中。
+    """
+    rest = b""
+    while True:
+        chunk = stream.read(block_size)
+        if not chunk:
+            break
+        chunk = rest + chunk
+        cut = chunk.rfind(b"\n") + 1
+        if cut == 0:
+            rest = chunk
+            continue
+        rest = chunk[cut:]
+        yield chunk[:cut]
+    if rest:
+        yield rest
+
+
+_OD_MAX_ITEM_BYTES = 8  # od 数据项的最大字节数，补齐的字节不会超过它
+
+
+class _DumpDecoder:
+    """
+    转储格式（xxd/hexdump/od）的逐块解码器，输出原始字节。
+
+    hexdump 和 od 会用单独一行 "*" 省略重复行，解码器在块之间保存
+    上一行的数据和偏移，遇到下一个偏移时补齐被省略的重复数据。
+
+    文件长度不是数据项字节数的整数倍时，od 会把最后一项补零输出；
+    末尾只有偏移的一行给出了实际长度，padding() 返回多解码出的字节数。
+    """
+
+    def __init__(self, fmt: str):
+        self.fmt = fmt
+        self.last_line = b""
+        self.last_offset = None  # 上一行数据的偏移文本
+        self.pending_repeat = False
+        self.offset_radix = 16 if fmt != FORMAT_OD else None
+        self.od_kind = None  # od 数据项类型：(进制, 每项字节数)
+        self.first_row = None  # od 第一行数据的偏移文本和字节数
+        self.end_offset = None  # 末尾只有偏移、没有数据的一行的偏移文本
+        self.decoded = 0  # 已输出的字节数
+
+    def feed(self, block: bytes) -> bytes:
+        data = self._feed(block)
+        self.decoded += len(data)
+        return data
+
+    def padding(self) -> int:
+        """
+        返回按末尾偏移行计算、超出实际长度的字节数（od 补齐最后一项产生）。
+        """
+        if self.end_offset is None or self.first_row is None:
+            return 0
+        item_bytes = self.od_kind[1] if self.od_kind else 1
+        # 只有一行数据时偏移进制未定：补齐的字节数必须小于一个数据项，据此确定进制
+        radixes = (self.offset_radix,) if self.offset_radix else (8, 16, 10)
+        for radix in radixes:
+            try:
+                length = int(self.end_offset, radix) - int(self.first_row[0], radix)
+            except ValueError:
+                continue
+            if 0 <= self.decoded - length < item_bytes:
+                return self.decoded - length
+        return 0
+
+    def _feed(self, block: bytes) -> bytes:
+        if self.fmt == FORMAT_XXD:
+            # xxd 不省略重复行，直接拼接十六进制区域后整体转换
+            return bytes.fromhex(b" ".join(_XXD_LINE.findall(block)).decode("ascii"))
+
+        pattern = _HEXDUMP_LINE if self.fmt == FORMAT_HEXDUMP else _OD_LINE
+        matches = pattern.findall(block)
+        if not matches:
+            return b""
+        if self.fmt == FORMAT_OD and self.od_kind is None:
+            self._detect_od(matches)
+        last_offset, last_hex, last_star = matches[-1]
+        self.end_offset = last_offset if not last_star and not last_hex.strip() else None
+
+        if not self.pending_repeat and b"\n*" not in block and not block.startswith(b"*"):
+            # 快速路径：没有省略行，整块一次转换
+            data = self._decode_lines([m[1] for m in matches])
+            # 只记住最后一行；od 偏移进制未确定时还需要前两行来判断
+            rows = matches[:2] + matches[-1:] if self.offset_radix is None else matches[-1:]
+            for offset, hex_part, _ in rows:
+                self._remember(offset, self._decode_lines([hex_part]))
+            return data
+
+        parts = []
+        for offset, hex_part, star in matches:
+            if star:
+                self.pending_repeat = True
+                continue
+            line = self._decode_lines([hex_part])
+            if self.pending_repeat:
+                parts.append(self._repeat_until(offset))
+            parts.append(line)
+            self._remember(offset, line)
+        return b"".join(parts)
+
+    def _remember(self, offset: bytes, line: bytes) -> None:
+        # 末尾只有偏移、没有数据的行不作为重复行的来源
+        if line:
+            if self.offset_radix is None:
+                self._detect_offset_radix(offset)
+            self.last_line = line
+            self.last_offset = offset
+            self.first_row = self.first_row or (offset, len(line))
+
+    def _offset(self, text: bytes) -> int:
+        if self.offset_radix is None:
+            # 只见到一行数据就遇到省略行时无法比较偏移：
+            # od 默认的八进制偏移为 7 位，-A x 的十六进制偏移为 6 位
+            self.offset_radix = 8 if len(text) == 7 and re.fullmatch(rb"[0-7]+", text) else 16
+        return int(text, self.offset_radix)
+
+    def _detect_offset_radix(self, offset: bytes) -> None:
+        """
+        用第二行与第一行的偏移差等于第一行字节数来判断 od 偏移的进制。
+        """
+        if self.first_row is None:
+            return
+        start, line_bytes = self.first_row
+        for radix in (8, 16, 10):
+            try:
+                if int(offset, radix) - int(start, radix) == line_bytes:
+                    self.offset_radix = radix
+                    return
+            except ValueError:
+                continue
+
+    def _repeat_until(self, offset: bytes) -> bytes:
+        self.pending_repeat = False
+        if self.last_offset is None or not self.last_line:
+            return b""
+        last_end = self._offset(self.last_offset) + len(self.last_line)
+        target = self._offset(offset)
+        if target <= last_end:
+            return b""
+        count, remainder = divmod(target - last_end, len(self.last_line))
+        return self.last_line * count + self.last_line[:remainder]
+
+    def _decode_lines(self, hex_parts: List[bytes]) -> bytes:
+        joined = b" ".join(hex_parts)
+        if self.fmt == FORMAT_HEXDUMP:
+            return bytes.fromhex(joined.decode("ascii"))
+
+        radix, size = self.od_kind
+        tokens = joined.split()
+        if not tokens:
+            return b""
+        if radix == 8:
+            # 定长 6 位八进制，逐列按权相加
+            chars = np.frombuffer(b"".join(tokens), dtype=np.uint8).reshape(-1, 6).astype(np.uint32) - ord("0")
+            words = (chars * (8 ** np.arange(5, -1, -1, dtype=np.uint32))).sum(axis=1)
+            return words.astype("<u2").tobytes()
+        if size == 1:
+            return bytes.fromhex(b"".join(tokens).decode("ascii"))
+        # od 按主机字节序（小端）输出多字节数据项
+        words = hex_tokens_to_array(tokens)
+        if (words >> np.uint64(8 * size)).any():
+            raise ValueError("od 数据项宽度不一致")
+        return words.astype(f"<u{size}").tobytes()
+
+    def _detect_od(self, matches) -> None:
+        """
+        根据首行数据项的宽度判断 od 的数据类型。
+        """
+        rows = [m for m in matches if not m[2] and m[1].split()]
+        tokens = rows[0][1].split() if rows else [b"00"]
+        width = len(tokens[0])
+        if width == 6 and all(re.fullmatch(rb"[0-7]{6}", t) for t in tokens):
+            self.od_kind = (8, 2)
+        elif width in (2, 4, 8, 16):
+            self.od_kind = (16, width // 2)
+        else:
+            raise ValueError(f"不支持的 od 数据项宽度：{width} 位十六进制")
+
+
+def _bytes_to_words(data: bytes, word_bytes: int, byteorder: str) -> np.ndarray:
+    dtype = np.dtype(f"{'>' if byteorder == 'big' else '<'}u{word_bytes}")
+    return np.frombuffer(data, dtype=dtype).astype(np.uint64)
+
+
+def _run_lengths(padded: np.ndarray, valid: np.ndarray, positions: np.ndarray,
+                 limits: Optional[np.ndarray], width: int) -> np.ndarray:
+    """
+    计算从每个位置开始、连续为有效字符（按 valid 查表）的字符个数，不超过 limits 和 width。
+
+    逐列只取每个位置之后的一个字符，不扫描整块文本，全部位置都结束时提前退出。
+    """
+    lengths = np.zeros(len(positions), dtype=np.int64)
+    alive = np.ones(len(positions), dtype=bool)
+    for column in range(width):
+        at = positions + column
+        alive &= valid[padded[at]]
+        if limits is not None:
+            alive &= at < limits
+        if not alive.any():
+            break
+        lengths += alive
+    return lengths
+
+
+def _parse_log_block(block: bytes) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+    """
+    解析一块日志文本，提取每行第一个 0x 数值及其前导时间戳。
+
+    直接在字节数组上向量化扫描：找出所有 "0x" 的位置并按行取第一个，
+    算出其后十六进制字符的长度，再按长度分组把字符矩阵一次性换算成数值。
+
+    Returns:
+        (数值数组, 时间戳数组)；时间戳数组中缺失的项为 NaN，整块都没有时间戳时为 None
+    """
+    arr = np.frombuffer(block, dtype=np.uint8)
+    size = len(arr)
+    if not size:
+        return np.zeros(0, dtype=np.uint64), None
+    # 末尾补零（非十六进制字符），保证后续按位置取字符不会越界，也保证每段都能找到终点
+    padded = np.concatenate([arr, np.zeros(_STAMP_WIDTH + 18, dtype=np.uint8)])
+
+    ends = np.flatnonzero(arr == ord("\n"))
+    if arr[-1] != ord("\n"):
+        ends = np.append(ends, size)
+    starts = np.concatenate([[0], ends[:-1] + 1])
+
+    # "0x"/"0X" 且后面紧跟至少一个十六进制字符
+    marks = np.flatnonzero((arr[:-1] == ord("0")) & ((arr[1:] | 0x20) == ord("x")))
+    marks = marks[_HEX_VALID[padded[marks + 2]]]
+    if not len(marks):
+        return np.zeros(0, dtype=np.uint64), None
+    first = np.searchsorted(marks, starts)
+    found = first < len(marks)
+    pos = marks[np.minimum(first, len(marks) - 1)]
+    found &= pos < ends
+    starts, pos = starts[found], pos[found]
+
+    digits_at = pos + 2
+    # 多扫描一位，超过 16 位的数值无法放入 64 位寄存器，直接报错而不是截断
+    lengths = _run_lengths(padded, _HEX_VALID, digits_at, None, 17)
+    if (lengths > 16).any():
+        raise ValueError("数值超过 16 位十六进制")
+    values = np.zeros(len(pos), dtype=np.uint64)
+    four = np.uint64(4)
+    for length in np.unique(lengths).tolist():
+        rows = np.flatnonzero(lengths == length)
+        start = digits_at[rows]
+        group = np.zeros(len(rows), dtype=np.uint64)
+        for column in range(length):
+            group = (group << four) | _HEX_LUT[padded[start + column]]
+        values[rows] = group
+
+    return values, _scan_timestamps(padded, starts, pos)
+
+
+def _scan_timestamps(padded: np.ndarray, starts: np.ndarray, limits: np.ndarray) -> Optional[np.ndarray]:
+    """
+    向量化解析行首的十进制时间戳（如 "12.345:" 或 "[12.345]"）。
+
+    Args:
+        padded: 末尾补零的文本字节数组
+        starts: 各行起始位置
+        limits: 各行 0x 数值的位置，时间戳必须在其之前结束
+
+    Returns:
+        时间戳数组，缺失的项为 NaN；全部缺失时为 None
+    """
+    # 跳过行首的空白和左括号
+    at = starts.copy()
+    for _ in range(_STAMP_LEAD):
+        lead = padded[at]
+        at += (lead == ord(" ")) | (lead == ord("\t")) | (lead == ord("["))
+
+    lengths = _run_lengths(padded, _NUMERIC_VALID, at, limits, _STAMP_WIDTH)
+    if not lengths.any():
+        return None
+
+    timestamps = np.full(len(at), np.nan)
+    for length in np.unique(lengths[lengths > 0]).tolist():
+        rows = np.flatnonzero(lengths == length)
+        start = at[rows]
+        value = np.zeros(len(rows))
+        scale = np.ones(len(rows))
+        dots = np.zeros(len(rows), dtype=np.int64)
+        for column in range(length):
+            chars = padded[start + column]
+            is_dot = chars == ord(".")
+            value = np.where(is_dot, value, value * 10 + (chars.astype(np.float64) - ord("0")))
+            # 小数点之后每多一位数字，除数乘以 10
+            scale = np.where((dots > 0) & ~is_dot, scale * 10, scale)
+            dots += is_dot
+        # 多个小数点或只有小数点的不是有效时间戳
+        valid = (dots <= 1) & (dots < length)
+        timestamps[rows] = np.where(valid, value / scale, np.nan)
+    return timestamps
+
+
+def import_blocks(blocks: Iterator[bytes], fmt: Optional[str] = None,
+                  word_bytes: int = IMPORT_WORD_BYTES,
+                  byteorder: str = IMPORT_BYTE_ORDER) -> Trace:
+    """
+    从文本块序列导入跟踪。
+
+    Args:
+        blocks: 在换行处截断的文本块
+        fmt: 格式名称，为 None 时根据第一块自动识别
+        word_bytes: 转储格式中每个样本的字节数（1、2、4 或 8）
+        byteorder: 转储格式中样本的字节序，"big" 或 "little"
+
+    Returns:
+        导入的跟踪
+
+    Raises:
+        ValueError: 无法识别格式、数据格式不受支持或没有解析到任何数据
+    """
+    if word_bytes not in (1, 2, 4, 8):
+        raise ValueError("每个样本的字节数必须是 1、2、4 或 8")
+    values: List[np.ndarray] = []
+    stamps: List[Optional[np.ndarray]] = []
+    decoder = None
+    carry = b""
+
+    for block in blocks:
+        if fmt is None:
+            fmt = detect_format(block[:65536])
+
+        if fmt == FORMAT_LOG:
+            block_values, block_stamps = _parse_log_block(block)
+            values.append(block_values)
+            stamps.append(block_stamps)
+            continue
+
+        if decoder is None:
+            decoder = _DumpDecoder(fmt)
+        data = carry + decoder.feed(block)
+        # 末尾的字节可能是 od 补齐的数据，留到最后确认实际长度后再转换
+        usable = max(len(data) - _OD_MAX_ITEM_BYTES, 0)
+        usable -= usable % word_bytes
+        carry = data[usable:]
+        values.append(_bytes_to_words(data[:usable], word_bytes, byteorder))
+
+    if decoder is not None and decoder.padding():
+        # 去掉 od 为补齐最后一项而多输出的字节
+        carry = carry[:len(carry) - decoder.padding()]
+    if carry:
+        # 末尾不足一个样本的字节补零
+        carry = carry.ljust(len(carry) + -len(carry) % word_bytes, b"\0")
+        values.append(_bytes_to_words(carry, word_bytes, byteorder))
+
+    result = np.concatenate(values) if values else np.zeros(0, dtype=np.uint64)
+    if not len(result):
+        raise ValueError("没有解析到任何数据")
+    timestamps = None
+    if any(block is not None for block in stamps):
+        timestamps = np.concatenate([
+            block if block is not None else np.full(len(block_values), np.nan)
+            for block, block_values in zip(stamps, values)
+        ])
+    return Trace(result, timestamps, fmt)
+
+
+def import_text(text: Union[str, bytes], fmt: Optional[str] = None,
+                word_bytes: int = IMPORT_WORD_BYTES,
+                byteorder: str = IMPORT_BYTE_ORDER,
+                block_size: int = IMPORT_BLOCK_SIZE) -> Trace:
+    """
+    从剪贴板等文本导入跟踪，参数含义同 import_blocks。
+    """
+    if isinstance(text, str):
+        text = text.encode("utf-8", errors="replace")
+
+    def blocks() -> Iterator[bytes]:
+        start = 0
+        while start < len(text):
+            end = text.find(b"\n", start + block_size)
+            end = len(text) if end < 0 else end + 1
+            yield text[start:end]
+            start = end
+
+    return import_blocks(blocks(), fmt, word_bytes, byteorder)
+
+
+def import_file(path: str, fmt: Optional[str] = None,
+                word_bytes: int = IMPORT_WORD_BYTES,
+                byteorder: str = IMPORT_BYTE_ORDER,
+                block_size: int = IMPORT_BLOCK_SIZE) -> Trace:
+    """
+    从文件导入跟踪，按块读取，参数含义同 import_blocks。
+    """
+    with open(path, "rb") as stream:
+        return import_blocks(iter_blocks(stream, block_size), fmt, word_bytes, byteorder)
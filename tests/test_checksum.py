@@ -0,0 +1,94 @@
+import mmap
+
+import numpy as np
+import pytest
+
+from core.checksum import (
+    CRC_PRESETS, CrcConfig, _crc_table, _finalize, _reflect, crc, crc_range, crc_words,
+    export_word_checksums, parity, popcount, range_checksums, value_to_bytes,
+)
+
+# 各预设对 "123456789" 的标准校验值
+_CHECK_VALUES = {
+    "CRC-8": 0xF4,
+    "CRC-8/MAXIM": 0xA1,
+    "CRC-16/XMODEM": 0x31C3,
+    "CRC-16/CCITT-FALSE": 0x29B1,
+    "CRC-16/MODBUS": 0x4B37,
+    "CRC-32": 0xCBF43926,
+    "CRC-32/MPEG-2": 0x0376E6E7,
+}
+
+
+def _crc_bytewise(data, cfg):
+    table = _crc_table(cfg.width, cfg.poly, cfg.ref_in)
+    if cfg.ref_in:
+        reg = _reflect(cfg.init, cfg.width)
+        for byte in data:
+            reg = (reg >> 8) ^ table[(reg ^ byte) & 0xFF]
+    else:
+        reg = cfg.init
+        for byte in data:
+            reg = ((reg << 8) & cfg.mask) ^ table[((reg >> (cfg.width - 8)) ^ byte) & 0xFF]
+    return _finalize(reg, cfg)
+
+
+@pytest.mark.parametrize("name", list(_CHECK_VALUES))
+def test_crc_check_values(name):
+    assert crc(b"123456789", CRC_PRESETS[name]) == _CHECK_VALUES[name]
+
+
+@pytest.mark.parametrize("name", list(CRC_PRESETS))
+@pytest.mark.parametrize("size", [(1 << 14) - 1, 1 << 14, 20011, 1 << 18])
+def test_crc_bulk_matches_bytewise(name, size):
+    data = np.random.default_rng(size).integers(0, 256, size, dtype=np.uint8).tobytes()
+    assert crc(data, CRC_PRESETS[name]) == _crc_bytewise(data, CRC_PRESETS[name])
+
+
+def test_crc_bulk_custom_configs():
+    rng = np.random.default_rng(1)
+    data = rng.integers(0, 256, 40000, dtype=np.uint8).tobytes()
+    for width in (8, 16, 32):
+        for ref_in in (False, True):
+            cfg = CrcConfig("custom", width, int(rng.integers(1 << width)) | 1,
+                            int(rng.integers(1 << width)), ref_in, not ref_in, int(rng.integers(1 << width)))
+            assert crc(data, cfg) == _crc_bytewise(data, cfg)
+
+
+def test_crc_words_matches_crc():
+    cfg = CRC_PRESETS["CRC-16/MODBUS"]
+    words = np.array([0, 1, 0x0123456789ABCDEF, (1 << 64) - 1], dtype=np.uint64)
+    expected = [crc(value_to_bytes(int(w), 8), cfg) for w in words]
+    assert crc_words(words, cfg).tolist() == expected
+
+
+def test_range_checksums():
+    data = bytes(range(256)) * 4
+    cfg = CRC_PRESETS["CRC-32"]
+    result = range_checksums(data, 16, 48, cfg)
+    assert result["crc"] == crc(data[16:48], cfg) == crc_range(data, 16, 48, cfg)
+    assert result["sum8"] == sum(data[16:48]) & 0xFF
+    assert result["sum16"] == sum(data[16:48]) & 0xFFFF
+    with pytest.raises(ValueError):
+        range_checksums(data, 0, len(data) + 1, cfg)
+
+
+def test_range_checksums_releases_mmap(tmp_path):
+    path = tmp_path / "dump.bin"
+    path.write_bytes(bytes(range(256)) * 100)
+    with open(path, "rb") as stream, mmap.mmap(stream.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        range_checksums(data, 0, len(data), CRC_PRESETS["CRC-16/MODBUS"])
+
+
+def test_export_word_checksums(tmp_path):
+    cfg = CRC_PRESETS["CRC-8"]
+    words = np.array([0, 1, 3, 0xFF00], dtype=np.uint64)
+    path = tmp_path / "out.csv"
+    odd = export_word_checksums(words, cfg, str(path), chunk_size=3)
+    lines = path.read_text(encoding="utf-8").splitlines()
+    assert lines[0] == "index,value,crc,parity,popcount"
+    assert len(lines) == 5
+    assert odd == sum(parity(int(w)) for w in words)
+    index, value, crc_text, bit, count = lines[3].split(",")
+    assert (int(index), int(value, 16), int(bit), int(count)) == (2, 3, 0, popcount(3))
+    assert int(crc_text, 16) == crc(value_to_bytes(3, 8), cfg)
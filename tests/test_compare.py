@@ -0,0 +1,52 @@
+import numpy as np
+import pytest
+
+from core.compare import compare_traces, diff_bit_indices
+
+
+def _brute_ranges(bad):
+    ranges, start = [], None
+    for index, value in enumerate(bad):
+        if value and start is None:
+            start = index
+        elif not value and start is not None:
+            ranges.append((start, index))
+            start = None
+    if start is not None:
+        ranges.append((start, len(bad)))
+    return ranges
+
+
+def test_diff_bit_indices():
+    assert diff_bit_indices(0b1010, 0b0110, 4) == [2, 3]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 16, 1 << 20])
+@pytest.mark.parametrize("max_ranges", [1, 5, 10000])
+def test_compare_traces_matches_brute_force(chunk_size, max_ranges):
+    rng = np.random.default_rng(chunk_size * 7 + max_ranges)
+    golden = rng.integers(0, 1 << 63, 500, dtype=np.uint64)
+    captured = golden.copy()
+    flips = rng.random(500) < 0.1
+    captured[flips] ^= np.uint64(1) << rng.integers(0, 64, flips.sum()).astype(np.uint64)
+
+    diff = compare_traces(captured, golden, chunk_size=chunk_size, max_ranges=max_ranges)
+    expected = _brute_ranges((captured != golden).tolist())
+
+    assert diff.mismatch_count == int(flips.sum())
+    assert diff.first_divergence == int(np.argmax(flips))
+    assert diff.mismatch_ranges == expected[:max_ranges]
+    assert diff.ranges_truncated == (len(expected) > max_ranges)
+    assert diff.bit_mismatch_counts.sum() == int(flips.sum())
+
+
+def test_next_mismatch_and_summary():
+    golden = np.zeros(10, dtype=np.uint64)
+    captured = golden.copy()
+    captured[[2, 3, 7]] = 1
+    diff = compare_traces(captured, golden)
+    assert diff.next_mismatch(-1) == 2
+    assert diff.next_mismatch(2) == 7
+    assert diff.next_mismatch(7) is None
+    assert "bit0×3" in diff.summary()
+    assert compare_traces(golden, golden).summary().startswith("完全一致")
@@ -0,0 +1,63 @@
+import random
+
+import pytest
+
+from core.incremental import IncrementalParser
+
+
+@pytest.mark.parametrize("base, start, edited", [
+    (16, "12345678", "1234AB5678"),  # 中间插入
+    (16, "1234AB5678", "12345678"),  # 中间删除
+    (16, "12345678", "123FF678"),  # 中间替换
+    (16, "DEADBEEF", "DEADDEADBEEF"),  # 插入与原文本重复的片段
+    (2, "1100110011", "110011110011"),
+    (2, "1100110011", "11010011"),
+    (2, "1100110011", "1101010011"),
+])
+def test_splice_middle_edits(base, start, edited):
+    parser = IncrementalParser(base)
+    assert parser.parse(start) == int(start, base)
+    assert parser.parse(edited) == int(edited, base)
+
+
+def test_empty_input():
+    parser = IncrementalParser(16)
+    assert parser.parse("") == 0
+    assert parser.parse("FF") == 0xFF
+    assert parser.parse("") == 0
+    assert parser.parse("1") == 1
+
+
+def test_invalid_digit_raises():
+    parser = IncrementalParser(16)
+    parser.parse("12")
+    with pytest.raises(ValueError):
+        parser.parse("1G2")
+
+
+def test_set_base_resets_state():
+    parser = IncrementalParser(16)
+    parser.parse("1010")
+    parser.set_base(2)
+    assert (parser.base, parser.text, parser.value) == (2, "", 0)
+    # 同样的文本按新进制重新解析，而不是复用上一进制的结果
+    assert parser.parse("1010") == 0b1010
+
+
+def test_decimal_falls_back_to_full_parse():
+    parser = IncrementalParser(10)
+    parser.parse("12345")
+    assert parser.parse("129345") == 129345
+
+
+@pytest.mark.parametrize("base, digits", [(16, "0123456789abcdefABCDEF"), (2, "01")])
+def test_random_edits_match_int(base, digits):
+    rng = random.Random(base)
+    parser = IncrementalParser(base)
+    text = ""
+    for _ in range(2000):
+        start = rng.randint(0, len(text))
+        end = rng.randint(start, min(len(text), start + 4))
+        insert = "".join(rng.choice(digits) for _ in range(rng.randint(0, 4)))
+        text = (text[:start] + insert + text[end:])[:40]
+        assert parser.parse(text) == (int(text, base) if text else 0)
@@ -0,0 +1,30 @@
+from core.register_library import RegisterEntry, RegisterLibrary
+
+
+def _library():
+    library = RegisterLibrary(":memory:")
+    library.add_many([
+        RegisterEntry("soc", "CTRL", 0xA000, 1.0),
+        RegisterEntry("soc", "CTRL_EXT", 0xB000, 2.0),
+        RegisterEntry("pmic", "CTRL", 0xA0FF, 3.0),
+        RegisterEntry("soc", "STATUS", 0xFFFFFFFFFFFFFFFF, 4.0),
+    ])
+    return library
+
+
+def test_search_by_prefix_and_device():
+    library = _library()
+    assert [e.name for e in library.search(name_prefix="CTRL")] == ["CTRL", "CTRL_EXT", "CTRL"]
+    assert [e.value for e in library.search(name_prefix="CTRL", device="soc")] == [0xB000, 0xA000]
+
+
+def test_search_field_uses_mask():
+    library = _library()
+    assert [e.device for e in library.search_field(15, 12, 0xA)] == ["pmic", "soc"]
+    assert library.search_field(3, 0, 0x5) == []
+
+
+def test_full_64_bit_values_round_trip():
+    library = _library()
+    assert library.search(name_prefix="STATUS")[0].value == (1 << 64) - 1
+    assert [e.name for e in library.search_field(63, 63, 1)] == ["STATUS"]
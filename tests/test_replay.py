@@ -0,0 +1,109 @@
+import random
+
+import numpy as np
+import pytest
+
+from core.replay import (
+    OP_AND, OP_CLEAR, OP_SET, OP_SHL, OP_SHR, OP_TOGGLE, OP_WRITE,
+    Replay, _match_op_block, _split_op_block, replay_text,
+)
+
+
+def _brute_force(kinds, operands, value, width):
+    full = (1 << width) - 1
+    states = []
+    for kind, operand in zip(kinds, operands):
+        operand = int(operand)
+        if kind == OP_SET:
+            value |= operand
+        elif kind == OP_CLEAR:
+            value &= ~operand
+        elif kind == OP_TOGGLE:
+            value ^= operand
+        elif kind == OP_WRITE:
+            value = operand
+        elif kind == OP_SHL:
+            value <<= operand
+        elif kind == OP_SHR:
+            value >>= operand
+        elif kind == OP_AND:
+            value &= operand
+        value &= full
+        states.append(value)
+    return states
+
+
+@pytest.mark.parametrize("width", [8, 13, 32, 64])
+@pytest.mark.parametrize("interval", [1, 4, 64])
+def test_replay_matches_sequential_loop(width, interval):
+    rng = random.Random(width * 1000 + interval)
+    for _ in range(20):
+        count = rng.randint(1, 300)
+        kinds = [rng.choice([OP_SET, OP_CLEAR, OP_TOGGLE, OP_SHL, OP_SHR, OP_AND, OP_WRITE]) for _ in range(count)]
+        operands = [rng.randint(0, 64) if kind in (OP_SHL, OP_SHR) else rng.getrandbits(64) for kind in kinds]
+        initial = rng.getrandbits(width)
+        replay = Replay(np.array(kinds), np.array(operands, dtype=np.uint64), initial, width, interval=interval)
+        expected = _brute_force(kinds, operands, initial, width)
+
+        assert [int(v) for v in replay.states()] == expected
+        for index in rng.sample(range(count), min(count, 20)):
+            assert replay.state_at(index) == expected[index]
+        assert replay.final == expected[-1]
+
+
+def test_replay_rejects_bad_arguments():
+    with pytest.raises(ValueError):
+        Replay(np.array([OP_SET]), np.array([1], dtype=np.uint64), interval=3)
+    with pytest.raises(IndexError):
+        Replay(np.array([OP_SET]), np.array([1], dtype=np.uint64)).state_at(1)
+
+
+def test_split_op_block_parses_regular_lines():
+    kinds, operands, stamps = _split_op_block(b"1.5: set 0x10\n[2] SHL 4\ntoggle ff\n")
+    assert kinds.tolist() == [OP_SET, OP_SHL, OP_TOGGLE]
+    assert operands.tolist() == [b"0x10", b"4", b"ff"]
+    assert stamps.tolist() == [b"1.5", b"2", b""]
+
+
+@pytest.mark.parametrize("block", [
+    b"1: set 0x1\nINFO set 0x2\n",  # 行首不是时间戳
+    b"set 0x1\n\nset 0x2\n",  # 空行
+    b"set 0x1 extra\n",  # 多余的词
+    b"set 0x0x1\n",  # 非法操作数
+    b"set 11112222333344445\n",  # 超过 16 位
+])
+def test_split_op_block_falls_back_on_irregular_lines(block):
+    assert _split_op_block(block) is None
+
+
+def test_match_op_block_skips_unrecognized_lines():
+    kinds, tokens, stamps = _match_op_block(b"# header\n1: set 0x1\nINFO set 0x2\n\n[3] shr 0x10\n")
+    assert kinds.tolist() == [OP_SET, OP_SHR]
+    assert tokens == [b"0x1", b"0x10"]
+    assert stamps.tolist() == [b"1", b"3"]
+
+
+@pytest.mark.parametrize("text", [
+    "1: set 0x1\nINFO set 0x2\n",
+    "1: set 0x1\nINFO set 0x2\n\n",
+])
+def test_fast_path_and_fallback_agree(text):
+    replay = replay_text(text)
+    assert replay.states().tolist() == [1]
+    assert replay.timestamps.tolist() == [1.0]
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("write 1\nshl 16\n", 1 << 16),
+    ("write 1\nshl 0x10\n", 1 << 16),
+    ("write 1\nshl 0x10\n\n", 1 << 16),
+    ("write 80000\nshr 0X0C\n", 0x80),
+])
+def test_shift_amount_radix(text, expected):
+    assert replay_text(text).final == expected
+
+
+@pytest.mark.parametrize("text", ["shl 65\n", "shl 0x41\n", "shr 1a\n"])
+def test_invalid_shift_amount(text):
+    with pytest.raises(ValueError):
+        replay_text(text)
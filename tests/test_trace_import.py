@@ -0,0 +1,58 @@
+import pytest
+
+from core.trace_import import hex_tokens_to_array, import_text
+
+
+def test_hex_tokens_accept_prefix():
+    assert hex_tokens_to_array([b"ff", b"0x10", b"0XFFFFFFFFFFFFFFFF"]).tolist() == [0xFF, 0x10, (1 << 64) - 1]
+
+
+def test_hex_tokens_reject_more_than_16_digits():
+    with pytest.raises(ValueError):
+        hex_tokens_to_array([b"123456789abcdef01"])
+
+
+def test_log_rejects_values_wider_than_64_bits():
+    assert import_text("1: 0x123456789abcdef0\n").values.tolist() == [0x123456789ABCDEF0]
+    with pytest.raises(ValueError):
+        import_text("1: 0x123456789abcdef01\n")
+
+
+@pytest.mark.parametrize("item", ["b80d54", "0102030405", "010203040506", "01020304050607"])
+def test_od_rejects_unsupported_item_width(item):
+    with pytest.raises(ValueError):
+        import_text(f" [a*\n000000 {item} {item}\n000010 {item} {item}\n")
+
+
+def test_rejects_unsupported_word_size():
+    with pytest.raises(ValueError):
+        import_text("00000000: 0102 0304  ....\n", word_bytes=3)
+
+
+# od 对长度不是数据项整数倍的文件补零输出最后一项，末尾偏移行给出实际长度（37 字节）
+_OD_ODD_LENGTH = {
+    "x4": (
+        "0000000 44434241 48474645 4c4b4a49 504f4e4d\n"
+        "0000020 54535251 58575655 5c5b5a59 605f5e5d\n"
+        "0000040 64636261 00000065\n"
+        "0000045\n"
+    ),
+    "default": (
+        "0000000 041101 042103 043105 044107 045111 046113 047115 050117\n"
+        "0000020 051121 052123 053125 054127 055131 056133 057135 060137\n"
+        "0000040 061141 062143 000145\n"
+        "0000045\n"
+    ),
+    "single-line": (
+        "000000 4241 4443 4645 4847 4a49 4c4b 004d\n"
+        "00000d\n"
+    ),
+}
+
+
+@pytest.mark.parametrize("name", list(_OD_ODD_LENGTH))
+@pytest.mark.parametrize("block_size", [16, 1 << 20])
+def test_od_trims_padding_of_last_item(name, block_size):
+    expected = bytes(range(0x41, 0x41 + (13 if name == "single-line" else 37)))
+    trace = import_text(_OD_ODD_LENGTH[name], word_bytes=1, block_size=block_size)
+    assert bytes(trace.values.astype("u1").tolist()) == expected
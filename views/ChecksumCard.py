@@ -0,0 +1,288 @@
+import mmap
+import re
+from typing import Optional, Tuple
+from PyQt5.QtCore import Qt, QRegularExpression
+from PyQt5.QtGui import QRegularExpressionValidator
+from PyQt5.QtWidgets import QFileDialog, QGridLayout, QHBoxLayout, QWidget
+from qfluentwidgets import (
+    BodyLabel, CardWidget, CheckBox, ComboBox, InfoBar, InfoBarPosition, LineEdit, PushButton, setFont,
+)
+
+from config import CHECKSUM_BYTE_COUNT
+from core.checksum import (
+    CRC_PRESETS, CrcConfig, crc_value, parity, popcount,
+    value_to_bytes, checksum8, xor8, range_checksums, export_word_checksums,
+)
+from core.replay import trace_values
+from views.TraceCard import TraceLoader
+
+# 区间写法：起始-结束（十六进制，结束偏移不含），如 0x100-0x200
+_RANGE_PATTERN = re.compile(r"^\s*(?:0[xX])?([0-9A-Fa-f]+)\s*-\s*(?:0[xX])?([0-9A-Fa-f]+)\s*$")
+
+
+def _parse_range(text: str) -> Tuple[int, Optional[int]]:
+    """
+    解析区间输入，留空表示整个文件（结束偏移为 None）。
+
+    Raises:
+        ValueError: 格式不正确或起始大于结束
+    """
+    if not text.strip():
+        return 0, None
+    match = _RANGE_PATTERN.match(text)
+    if match is None:
+        raise ValueError(f"无法识别的区间: {text}")
+    start, end = int(match.group(1), 16), int(match.group(2), 16)
+    if start > end:
+        raise ValueError("区间起始偏移大于结束偏移")
+    return start, end
+
+
+def _checksum_file(source):
+    """
+    计算二进制转储文件中指定区间的校验，返回 (起始, 结束, 结果字典, CRC 配置)。
+    """
+    path, start, end, cfg = source
+    with open(path, "rb") as stream, mmap.mmap(stream.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        end = len(data) if end is None else end
+        return start, end, range_checksums(data, start, end, cfg), cfg
+
+
+def _export_trace(source):
+    trace, path, cfg = source
+    values = trace_values(trace)
+    return len(values), export_word_checksums(values, cfg, path, CHECKSUM_BYTE_COUNT)
+
+
+class ChecksumCard(CardWidget):
+    """
+    校验计算面板，显示当前寄存器值的奇偶校验、置位数、CRC 和校验和；
+    也可对转储文件的一段区间批量计算，或将跟踪中每个字的校验结果导出为 CSV。
+    """
+
+    def __init__(self, parent: Optional[QWidget] = None):
+        super().__init__(parent)
+        self._value = 0
+        self.trace = None
+        self.worker = None
+
+        layout = QGridLayout(self)
+        layout.setContentsMargins(8, 8, 8, 8)
+        layout.setHorizontalSpacing(8)
+        layout.setVerticalSpacing(5)
+
+        title_label = BodyLabel("校验")
+        setFont(title_label, 10)
+        layout.addWidget(title_label, 0, 0)
+
+        self.presetBox = ComboBox(self)
+        self.presetBox.addItems(list(CRC_PRESETS.keys()))
+        setFont(self.presetBox, 9)
+        self.presetBox.currentTextChanged.connect(self._load_preset)
+        layout.addWidget(self.presetBox, 0, 1, 1, 2)
+
+        # 自定义 CRC 参数：多项式、初值、输出异或值
+        hex_validator = QRegularExpressionValidator(QRegularExpression(r"[0-9A-Fa-f]{0,8}"), self)
+        param_layout = QHBoxLayout()
+        param_layout.setSpacing(5)
+        self.polyEntry = self._create_param_entry("多项式", hex_validator, param_layout)
+        self.initEntry = self._create_param_entry("初值", hex_validator, param_layout)
+        self.xorEntry = self._create_param_entry("异或", hex_validator, param_layout)
+
+        self.refInCheck = CheckBox("输入反转", self)
+        self.refOutCheck = CheckBox("输出反转", self)
+        setFont(self.refInCheck, 9)
+        setFont(self.refOutCheck, 9)
+        self.refInCheck.stateChanged.connect(self.refresh)
+        self.refOutCheck.stateChanged.connect(self.refresh)
+        param_layout.addWidget(self.refInCheck)
+        param_layout.addWidget(self.refOutCheck)
+        layout.addLayout(param_layout, 0, 3, 1, 3)
+
+        self.parityLabel = self._create_result_label(layout, 1, 0)
+        self.popcountLabel = self._create_result_label(layout, 1, 1)
+        self.crcLabel = self._create_result_label(layout, 1, 2)
+        self.sumLabel = self._create_result_label(layout, 1, 3)
+        self.xorLabel = self._create_result_label(layout, 1, 4)
+
+        # 批量计算：转储文件区间、跟踪逐字导出
+        self.rangeEntry = LineEdit(self)
+        self.rangeEntry.setPlaceholderText("区间，如 0x100-0x200，留空为整个文件")
+        setFont(self.rangeEntry, 9)
+        layout.addWidget(self.rangeEntry, 2, 0, 1, 2)
+        rangeButton = PushButton("文件区间校验")
+        setFont(rangeButton, 9)
+        rangeButton.clicked.connect(self._choose_dump)
+        layout.addWidget(rangeButton, 2, 2)
+        self.traceButton = PushButton("跟踪逐字导出")
+        setFont(self.traceButton, 9)
+        self.traceButton.setEnabled(False)
+        self.traceButton.clicked.connect(self._choose_export)
+        layout.addWidget(self.traceButton, 2, 3)
+        self.batchLabel = BodyLabel(self)
+        self.batchLabel.setTextInteractionFlags(Qt.TextInteractionFlag.TextSelectableByMouse)
+        setFont(self.batchLabel, 9)
+        layout.addWidget(self.batchLabel, 3, 0, 1, 6)
+
+        self._load_preset(self.presetBox.currentText())
+
+    def _create_param_entry(self, name: str, validator: QRegularExpressionValidator,
+                            layout: QHBoxLayout) -> LineEdit:
+        """
+        创建一个十六进制参数输入框并加入布局。
+        """
+        label = BodyLabel(name)
+        setFont(label, 9)
+        entry = LineEdit(self)
+        entry.setValidator(validator)
+        entry.setFixedWidth(90)
+        entry.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        setFont(entry, 9)
+        entry.textEdited.connect(self.refresh)
+        layout.addWidget(label)
+        layout.addWidget(entry)
+        return entry
+
+    def _create_result_label(self, layout: QGridLayout, row: int, column: int) -> BodyLabel:
+        label = BodyLabel()
+        label.setTextInteractionFlags(Qt.TextInteractionFlag.TextSelectableByMouse)
+        setFont(label, 10)
+        layout.addWidget(label, row, column)
+        return label
+
+    def _load_preset(self, name: str) -> None:
+        """
+        将预设的 CRC 参数填入自定义参数框。
+        """
+        cfg = CRC_PRESETS.get(name)
+        if cfg is None:
+            return
+        digits = cfg.width // 4
+        self.polyEntry.setText(f"{cfg.poly:0{digits}X}")
+        self.initEntry.setText(f"{cfg.init:0{digits}X}")
+        self.xorEntry.setText(f"{cfg.xor_out:0{digits}X}")
+        for check, state in ((self.refInCheck, cfg.ref_in), (self.refOutCheck, cfg.ref_out)):
+            check.blockSignals(True)
+            check.setChecked(state)
+            check.blockSignals(False)
+        self.refresh()
+
+    def current_config(self) -> CrcConfig:
+        """
+        根据界面上的参数构造 CRC 配置。
+
+        Returns:
+            当前的 CRC 参数配置
+        """
+        preset = CRC_PRESETS[self.presetBox.currentText()]
+        mask = preset.mask
+
+        def parse(entry: LineEdit) -> int:
+            text = entry.text().strip()
+            return int(text, 16) & mask if text else 0
+
+        return CrcConfig(
+            name=preset.name,
+            width=preset.width,
+            poly=parse(self.polyEntry),
+            init=parse(self.initEntry),
+            ref_in=self.refInCheck.isChecked(),
+            ref_out=self.refOutCheck.isChecked(),
+            xor_out=parse(self.xorEntry),
+        )
+
+    def set_value(self, value: int) -> None:
+        """
+        设置要计算的寄存器值并刷新结果。
+
+        Args:
+            value: 当前寄存器值
+        """
+        self._value = value
+        self.refresh()
+
+    def refresh(self) -> None:
+        """
+        重新计算并显示所有校验结果。
+        """
+        value = self._value
+        cfg = self.current_config()
+        data = value_to_bytes(value, CHECKSUM_BYTE_COUNT)
+        digits = cfg.width // 4
+
+        self.parityLabel.setText(f"奇偶: {parity(value)}")
+        self.popcountLabel.setText(f"置位数: {popcount(value)}")
+        self.crcLabel.setText(f"CRC: {crc_value(value, cfg, CHECKSUM_BYTE_COUNT):0{digits}X}")
+        self.sumLabel.setText(f"累加和: {checksum8(data):02X}")
+        self.xorLabel.setText(f"异或和: {xor8(data):02X}")
+
+    def set_trace(self, trace) -> None:
+        """
+        设置用于逐字导出的当前跟踪（Trace 或操作日志的回放）。
+        """
+        self.trace = trace
+        self.traceButton.setEnabled(trace is not None)
+
+    def checksum_file(self, path: str) -> None:
+        """
+        在后台计算二进制转储文件中所填区间的 CRC 与校验和。
+        """
+        try:
+            start, end = _parse_range(self.rangeEntry.text())
+        except ValueError as e:
+            self._on_failed(str(e))
+            return
+        self._start_worker(_checksum_file, (path, start, end, self.current_config()),
+                           self._on_range_done, "正在计算区间校验...")
+
+    def export_trace(self, path: str) -> None:
+        """
+        在后台对当前跟踪的每个字计算 CRC、偶校验位与置位数，并导出为 CSV。
+        """
+        if self.trace is not None:
+            self._start_worker(_export_trace, (self.trace, path, self.current_config()),
+                               self._on_export_done, "正在导出逐字校验...")
+
+    def _choose_dump(self) -> None:
+        path, _ = QFileDialog.getOpenFileName(self, "选择转储文件", "", "二进制文件 (*.bin *.dump *.img);;所有文件 (*)")
+        if path:
+            self.checksum_file(path)
+
+    def _choose_export(self) -> None:
+        path, _ = QFileDialog.getSaveFileName(self, "导出逐字校验", "checksums.csv", "CSV 文件 (*.csv)")
+        if path:
+            self.export_trace(path)
+
+    def _start_worker(self, func, source, on_done, busy_text: str) -> None:
+        if self.worker is not None and self.worker.isRunning():
+            return
+        self.batchLabel.setText(busy_text)
+        self.worker = TraceLoader(func, source, self)
+        self.worker.loaded.connect(on_done)
+        self.worker.failed.connect(self._on_failed)
+        self.worker.start()
+
+    def _on_range_done(self, result) -> None:
+        start, end, sums, cfg = result
+        digits = cfg.width // 4
+        self.batchLabel.setText(
+            f"区间 {start:#X}-{end:#X}（{end - start} 字节）  CRC: {sums['crc']:0{digits}X}  "
+            f"累加和: {sums['sum8']:02X}  16 位累加和: {sums['sum16']:04X}  "
+            f"反码和: {sums['inet']:04X}  异或和: {sums['xor8']:02X}"
+        )
+
+    def _on_export_done(self, result) -> None:
+        count, odd = result
+        self.batchLabel.setText(f"已导出 {count} 个字的校验结果，其中偶校验位为 1 的有 {odd} 个")
+
+    def _on_failed(self, message: str) -> None:
+        self.batchLabel.setText("计算失败")
+        InfoBar.warning(
+            title="计算失败",
+            content=message,
+            orient=Qt.Orientation.Horizontal,
+            isClosable=True,
+            position=InfoBarPosition.TOP,
+            duration=3000,
+            parent=self.window()
+        )
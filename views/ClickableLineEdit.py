@@ -29,11 +29,12 @@ class ClickableLineEdit(LineEdit):
         
         self.setStyleSheet(f"QLineEdit{{background: transparent; color: {text_color}; border-radius: 6px; border: 1px solid {border_color}; font-size: 16px; font-weight: bold}}")
         
-    def updateStyle(self, is_high: bool):
+    def updateStyle(self, is_high: bool, is_diff: bool = False):
         """
-        更新样式，根据比特值设置不同的背景色和圆角效果
+        更新样式，根据比特值设置不同的背景色和圆角效果。
+        对比模式下与对比值不同的比特位使用醒目的边框高亮。
         """
-        from config import BIT_HIGH_COLOR
+        from config import BIT_HIGH_COLOR, BIT_DIFF_COLOR
         from qfluentwidgets import isDarkTheme
         
         # 根据当前主题动态调整颜色
@@ -43,12 +44,16 @@ class ClickableLineEdit(LineEdit):
             # 1值的比特位：黄色背景，文字颜色根据主题调整
             text_color = "black" if dark_theme else "black"
             border_color = "rgba(0, 0, 0, 0.4)" if dark_theme else "rgba(0, 0, 0, 0.6)"
-            self.setStyleSheet(f"QLineEdit{{background-color: {BIT_HIGH_COLOR}; color: {text_color}; border-radius: 6px; border: 1px solid {border_color}; font-size: 16px; font-weight: bold}}")
+            background = f"background-color: {BIT_HIGH_COLOR}"
         else:
             # 0值的比特位：透明背景，文字颜色根据主题调整
             text_color = "white" if dark_theme else "black"
             border_color = "rgba(255, 255, 255, 0.2)" if dark_theme else "rgba(0, 0, 0, 0.2)"
-            self.setStyleSheet(f"QLineEdit{{background: transparent; color: {text_color}; border-radius: 6px; border: 1px solid {border_color}; font-size: 16px; font-weight: bold}}")
+            background = "background: transparent"
+
+        # 差异比特位：加粗的高亮边框
+        border = f"3px solid {BIT_DIFF_COLOR}" if is_diff else f"1px solid {border_color}"
+        self.setStyleSheet(f"QLineEdit{{{background}; color: {text_color}; border-radius: 6px; border: {border}; font-size: 16px; font-weight: bold}}")
 
     def mousePressEvent(self, event: QMouseEvent) -> None:
         if event.button() == Qt.LeftButton:
@@ -0,0 +1,141 @@
+from typing import Optional
+from PyQt5.QtCore import Qt, QRegularExpression, pyqtSignal
+from PyQt5.QtGui import QRegularExpressionValidator
+from PyQt5.QtWidgets import QHBoxLayout, QVBoxLayout, QWidget
+from qfluentwidgets import BodyLabel, CardWidget, LineEdit, SwitchButton, setFont
+
+from config import MAX_BIT_COUNT
+from core.compare import diff_bits
+
+# 各进制对应的输入验证正则
+_BASE_PATTERNS = {16: r"[0-9A-Fa-f]*", 10: r"[0-9]*", 2: r"[01]*"}
+
+
+class CompareCard(CardWidget):
+    """
+    A/B 对比面板：输入对比值 B（或由基准跟踪给出），与当前值 A 并排解码并显示异或结果。
+    """
+    compareChanged = pyqtSignal()
+
+    def __init__(self, parent: Optional[QWidget] = None):
+        super().__init__(parent)
+        self._base = 16
+        self._value = 0
+        self._reference = 0
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(8, 8, 8, 8)
+        layout.setSpacing(5)
+
+        header_layout = QHBoxLayout()
+        title_label = BodyLabel("对比")
+        setFont(title_label, 10)
+        self.modeSwitch = SwitchButton(self)
+        self.modeSwitch.setOnText("开")
+        self.modeSwitch.setOffText("关")
+        self.modeSwitch.checkedChanged.connect(lambda _: self.compareChanged.emit())
+        header_layout.addWidget(title_label)
+        header_layout.addStretch(1)
+        header_layout.addWidget(self.modeSwitch)
+
+        self.valueEntry = LineEdit(self)
+        self.valueEntry.setPlaceholderText("对比值 B")
+        self.valueEntry.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        setFont(self.valueEntry, 12)
+        self.valueEntry.textEdited.connect(self._on_value_edited)
+        self._validators = {
+            base: QRegularExpressionValidator(QRegularExpression(pattern), self.valueEntry)
+            for base, pattern in _BASE_PATTERNS.items()
+        }
+        self.valueEntry.setValidator(self._validators[self._base])
+
+        self.decodeLabel = BodyLabel(self)
+        self.decodeLabel.setTextInteractionFlags(Qt.TextInteractionFlag.TextSelectableByMouse)
+        setFont(self.decodeLabel, 9)
+
+        layout.addLayout(header_layout)
+        layout.addWidget(self.valueEntry)
+        layout.addWidget(self.decodeLabel)
+
+        self._refresh_decode()
+
+    def is_enabled(self) -> bool:
+        """
+        对比模式是否开启。
+        """
+        return self.modeSwitch.isChecked()
+
+    def set_enabled(self, enabled: bool) -> None:
+        """
+        开启或关闭对比模式。
+        """
+        self.modeSwitch.setChecked(enabled)
+
+    def value(self) -> int:
+        """
+        获取对比值 B。
+        """
+        return self._value
+
+    def set_value(self, value: int) -> None:
+        """
+        设置对比值 B 并按当前进制显示。
+        """
+        self._value = value & ((1 << MAX_BIT_COUNT) - 1)
+        self._show_value()
+        self._refresh_decode()
+        self.compareChanged.emit()
+
+    def set_base(self, base: int) -> None:
+        """
+        切换对比值输入框的进制，已输入的值按新进制重新显示。
+
+        Args:
+            base: 进制，16、10 或 2
+        """
+        if base not in self._validators or base == self._base:
+            return
+        self._base = base
+        self.valueEntry.setValidator(self._validators[base])
+        self._show_value()
+
+    def set_reference(self, value: int) -> None:
+        """
+        设置当前值 A，用于显示异或结果。
+        """
+        self._reference = value
+        self._refresh_decode()
+
+    def diff_mask(self) -> int:
+        """
+        返回 A 与 B 的差异掩码，对比模式关闭时返回 0。
+        """
+        if not self.is_enabled():
+            return 0
+        return diff_bits(self._reference, self._value, MAX_BIT_COUNT)
+
+    def _show_value(self) -> None:
+        fmt = {16: 'X', 10: 'd', 2: 'b'}[self._base]
+        self.valueEntry.setText(format(self._value, fmt))
+
+    def _on_value_edited(self, text: str) -> None:
+        text = text.strip()
+        try:
+            value = int(text, self._base) if text else 0
+        except ValueError:
+            return
+        self._value = value & ((1 << MAX_BIT_COUNT) - 1)
+        self._refresh_decode()
+        self.compareChanged.emit()
+
+    def _refresh_decode(self) -> None:
+        """
+        并排显示 A、B 的十六进制解码以及异或结果与差异位数。
+        """
+        digits = MAX_BIT_COUNT // 4
+        xor = diff_bits(self._reference, self._value, MAX_BIT_COUNT)
+        self.decodeLabel.setText(
+            f"A: {self._reference:0{digits}X}\n"
+            f"B: {self._value:0{digits}X}\n"
+            f"A^B: {xor:0{digits}X}  差异位数: {bin(xor).count('1')}"
+        )
@@ -0,0 +1,170 @@
+import re
+import sqlite3
+import time
+from typing import Optional
+from PyQt5.QtCore import Qt, pyqtSignal
+from PyQt5.QtWidgets import QGridLayout, QListWidgetItem, QWidget
+from qfluentwidgets import (
+    BodyLabel, CardWidget, InfoBar, InfoBarPosition, LineEdit, ListWidget, PushButton, setFont,
+)
+
+from config import LIBRARY_PATH, LIBRARY_SEARCH_LIMIT, MAX_BIT_COUNT
+from core.register_library import RegisterEntry, RegisterLibrary, field_mask
+
+# 位段查询语法：高位:低位=值 或 单个比特=值，值按十六进制解析（可带 0x 前缀）
+_FIELD_PATTERN = re.compile(r"^\s*(\d+)\s*(?::\s*(\d+))?\s*=\s*(?:0[xX])?([0-9A-Fa-f]+)\s*$")
+
+
+class LibraryCard(CardWidget):
+    """
+    寄存器库面板：保存当前值，按设备、名称前缀和位段查询，双击结果调回数值。
+    """
+    valueRecalled = pyqtSignal(object)  # 64 位值超出 C++ int 范围，按 Python 对象传递
+
+    def __init__(self, parent: Optional[QWidget] = None):
+        super().__init__(parent)
+        self.library = None  # 首次使用时才打开数据库，不拖慢启动
+        self._value = 0
+
+        layout = QGridLayout(self)
+        layout.setContentsMargins(8, 8, 8, 8)
+        layout.setSpacing(5)
+
+        title_label = BodyLabel("寄存器库")
+        setFont(title_label, 10)
+        layout.addWidget(title_label, 0, 0, 1, 2)
+
+        self.deviceEntry = self._create_entry("设备")
+        self.nameEntry = self._create_entry("寄存器名")
+        self.notesEntry = self._create_entry("备注")
+        saveButton = PushButton("保存当前值")
+        setFont(saveButton, 9)
+        saveButton.clicked.connect(self.save_current)
+        layout.addWidget(self.deviceEntry, 1, 0)
+        layout.addWidget(self.nameEntry, 1, 1)
+        layout.addWidget(self.notesEntry, 2, 0)
+        layout.addWidget(saveButton, 2, 1)
+
+        self.prefixEntry = self._create_entry("名称前缀")
+        self.fieldEntry = self._create_entry("位段，如 15:12=A")
+        self.deviceEntry.returnPressed.connect(self.search)
+        self.prefixEntry.returnPressed.connect(self.search)
+        self.fieldEntry.returnPressed.connect(self.search)
+        layout.addWidget(self.prefixEntry, 3, 0)
+        layout.addWidget(self.fieldEntry, 3, 1)
+
+        self.resultList = ListWidget(self)
+        setFont(self.resultList, 9)
+        self.resultList.itemDoubleClicked.connect(self._on_item_double_clicked)
+        layout.addWidget(self.resultList, 4, 0, 1, 2)
+        layout.setRowStretch(4, 1)
+
+    def _create_entry(self, placeholder: str) -> LineEdit:
+        entry = LineEdit(self)
+        entry.setPlaceholderText(placeholder)
+        entry.setClearButtonEnabled(True)
+        setFont(entry, 9)
+        return entry
+
+    def _open(self) -> RegisterLibrary:
+        if self.library is None:
+            self.library = RegisterLibrary(LIBRARY_PATH)
+        return self.library
+
+    def close_library(self) -> None:
+        """
+        关闭数据库连接，WAL 日志在关闭时写回主数据库文件。
+        """
+        if self.library is not None:
+            self.library.close()
+            self.library = None
+
+    def set_value(self, value: int) -> None:
+        """
+        设置当前寄存器值，保存时使用。
+        """
+        self._value = value
+
+    def save_current(self) -> None:
+        """
+        将当前值以填写的设备名、寄存器名和备注保存到库中。
+        """
+        name = self.nameEntry.text().strip()
+        if not name:
+            self._warn("保存失败", "请填写寄存器名")
+            return
+        entry = RegisterEntry(
+            device=self.deviceEntry.text().strip(),
+            name=name,
+            value=self._value,
+            timestamp=time.time(),
+            notes=self.notesEntry.text().strip(),
+        )
+        try:
+            self._open().add(entry)
+        except (sqlite3.Error, OSError) as e:
+            self._warn("保存失败", str(e))
+            return
+        self.search()
+
+    def search(self) -> None:
+        """
+        按设备、名称前缀和位段条件查询并刷新结果列表，设备为空时不限制设备。
+        """
+        mask, expected = 0, 0
+        field_text = self.fieldEntry.text().strip()
+        if field_text:
+            match = _FIELD_PATTERN.match(field_text)
+            if match is None:
+                self._warn("查询失败", "位段格式应为 高位:低位=值，例如 15:12=A")
+                return
+            high = int(match.group(1))
+            low = int(match.group(2)) if match.group(2) is not None else high
+            high, low = max(high, low), min(high, low)
+            if high >= MAX_BIT_COUNT:
+                self._warn("查询失败", f"比特位编号必须小于 {MAX_BIT_COUNT}")
+                return
+            value = int(match.group(3), 16)
+            if value >> (high - low + 1):
+                self._warn("查询失败", f"值 {value:X} 超出 {high}:{low} 位段的范围")
+                return
+            mask = field_mask(high, low)
+            expected = value << low
+
+        try:
+            entries = self._open().search(
+                name_prefix=self.prefixEntry.text().strip(),
+                device=self.deviceEntry.text().strip() or None,
+                mask=mask,
+                expected=expected,
+                limit=LIBRARY_SEARCH_LIMIT,
+            )
+        except (sqlite3.Error, OSError) as e:
+            self._warn("查询失败", str(e))
+            return
+
+        self.resultList.clear()
+        digits = MAX_BIT_COUNT // 4
+        for entry in entries:
+            stamp = time.strftime("%Y-%m-%d %H:%M", time.localtime(entry.timestamp))
+            label = f"{entry.device}/{entry.name}  {entry.value:0{digits}X}  {stamp}"
+            if entry.notes:
+                label += f"  {entry.notes}"
+            item = QListWidgetItem(label)
+            item.setData(Qt.ItemDataRole.UserRole, str(entry.value))
+            self.resultList.addItem(item)
+
+    def _on_item_double_clicked(self, item: QListWidgetItem) -> None:
+        # 以字符串保存，避免 64 位无符号值经 QVariant 转换时溢出
+        self.valueRecalled.emit(int(item.data(Qt.ItemDataRole.UserRole)))
+
+    def _warn(self, title: str, content: str) -> None:
+        InfoBar.warning(
+            title=title,
+            content=content,
+            orient=Qt.Orientation.Horizontal,
+            isClosable=True,
+            position=InfoBarPosition.TOP,
+            duration=3000,
+            parent=self.window()
+        )
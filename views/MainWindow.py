@@ -1,13 +1,17 @@
 import sys
+import ctypes
+import time
 from typing import Optional
+import darkdetect
 from PyQt5.QtCore import Qt, QEvent, QRegularExpression, QTimer
-from PyQt5.QtGui import QIcon, QRegularExpressionValidator
-from PyQt5.QtWidgets import QVBoxLayout, QWidget, QHBoxLayout, QGridLayout
+from PyQt5.QtGui import QIcon, QKeySequence, QRegularExpressionValidator
+from PyQt5.QtWidgets import QApplication, QVBoxLayout, QWidget, QHBoxLayout, QGridLayout
 
 from config import (
     APP_NAME, MAIN_ICON, WINDOW_WIDTH, WINDOW_HEIGHT,
     MAX_DIGIT, MAX_BIT_PER_DIGIT, MAX_BIT_COUNT,
     BIT_HIGH_COLOR, BIT_LOW_COLOR, MAX_SHIFT_VALUE,
+    INPUT_IMMEDIATE_COST, INPUT_IMMEDIATE_LENGTH, INPUT_DEBOUNCE_MIN, INPUT_DEBOUNCE_MAX,
 )
 
 # ✅ 正确导入 qfluentwidgets 组件
@@ -27,11 +31,23 @@ from qfluentwidgets import (
     FluentWindow,
     FluentWidget,
     SystemThemeListener,
-    isDarkTheme
+    isDarkTheme,
+    updateStyleSheet,
 )
 from qfluentwidgets.common.config import qconfig
 from PyQt5.QtCore import QTimer
+from core.idle_monitor import IdleMonitor, IdleReport
+from core.incremental import IncrementalParser
 from views.ClickableLineEdit import ClickableLineEdit
+from views.ChecksumCard import ChecksumCard
+from views.CompareCard import CompareCard
+from views.LibraryCard import LibraryCard
+from views.TraceCard import TraceCard
+
+if sys.platform == "win32":
+    from ctypes.wintypes import MSG
+
+WM_SETTINGCHANGE = 0x001A
 
 
 class MainWindow(FluentWidget):
@@ -45,8 +61,11 @@ class MainWindow(FluentWidget):
         from qfluentwidgets import Theme
         setTheme(Theme.AUTO)  # 这是关键！
 
-        # 创建主题监听器
-        self.themeListener = SystemThemeListener(self)
+        # Windows 下通过 WM_SETTINGCHANGE 消息感知系统主题变化，无需常驻监听线程；
+        # 其他平台退回到主题监听线程
+        self.themeListener = None if sys.platform == "win32" else SystemThemeListener(self)
+        self.lowPower = False  # 低功耗模式：关闭 Mica 等特效和动画
+        self.cursorFlashTime = QApplication.cursorFlashTime()  # 退出低功耗模式时恢复光标闪烁
 
         # 注意：启用 Mica 后，不要手动设置窗口背景色！
 
@@ -56,6 +75,15 @@ class MainWindow(FluentWidget):
         self.bitCount = MAX_BIT_COUNT
         self.bitValue = [0] * self.bitCount
         self.bitEntry = []
+        self.bitDiff = [False] * self.bitCount  # 对比模式下各比特位是否与对比值不同
+        self.keepAlive = False  # 预热模式下关闭窗口只隐藏，不退出
+
+        # 结果输入框的增量解析与自适应防抖
+        self.inputParser = IncrementalParser(16)
+        self.lastParseCost = 0.0  # 上一次更新比特位的耗时（毫秒）
+        self.parseTimer = QTimer(self)
+        self.parseTimer.setSingleShot(True)
+        self.parseTimer.timeout.connect(self.calculate_bits)
 
         self.resize(WINDOW_WIDTH, WINDOW_HEIGHT)
 
@@ -76,7 +104,8 @@ class MainWindow(FluentWidget):
         qconfig.themeChanged.connect(self.on_theme_changed)
 
         # 启动主题监听器
-        self.themeListener.start()
+        if self.themeListener is not None:
+            self.themeListener.start()
 
         self.clear_bits()
 
@@ -148,7 +177,7 @@ class MainWindow(FluentWidget):
             entry: 要格式化的比特输入框
             val: 比特值（0或1）
         """
-        entry.updateStyle(val == 1)
+        entry.updateStyle(val == 1, self.bitDiff[entry.index])
 
     def clear_bits(self) -> None:
         """
@@ -175,13 +204,8 @@ class MainWindow(FluentWidget):
             return 0
             
         try:
-            if self.hexRadio.isChecked():
-                return int(text, 16)
-            elif self.decRadio.isChecked():
-                return int(text, 10)
-            elif self.binRadio.isChecked():
-                return int(text, 2)
-            return 0
+            # 增量解析：只重新解析与上一次文本相比发生变化的数字
+            return self.inputParser.parse(text)
         except ValueError as e:
             # 不显示错误信息，因为用户可能正在输入过程中
             return 0
@@ -204,6 +228,7 @@ class MainWindow(FluentWidget):
         elif self.binRadio.isChecked():
             self.wordEntry.setText(f'{v:b}')
         self.wordEntry.blockSignals(False)
+        self.inputParser.reset(self.wordEntry.text(), v)
         self.update_bits_from_value(v)
 
     def calculate_result(self) -> int:
@@ -226,9 +251,33 @@ class MainWindow(FluentWidget):
         根据输入值计算并更新所有比特位的状态。
         
         获取当前输入值，并根据该值更新所有比特位的显示状态。
+        记录本次更新耗时，供自适应防抖使用。
         """
+        self.parseTimer.stop()
+        start = time.perf_counter()
         value = self.get_result()
         self.update_bits_from_value(value)
+        self.lastParseCost = (time.perf_counter() - start) * 1000
+
+    def on_word_edited(self, text: str) -> None:
+        """
+        结果输入框编辑处理函数。
+
+        上一次更新足够快时立即更新比特位；否则按上一次耗时推迟更新，
+        连续输入时只在停顿后更新一次。
+        """
+        if self.lastParseCost < INPUT_IMMEDIATE_COST and len(text) <= INPUT_IMMEDIATE_LENGTH:
+            self.calculate_bits()
+            return
+        interval = int(min(max(self.lastParseCost * 2, INPUT_DEBOUNCE_MIN), INPUT_DEBOUNCE_MAX))
+        self.parseTimer.start(interval)
+
+    def _flush_pending_parse(self) -> None:
+        """
+        立即执行尚未完成的防抖更新，确保比特位与输入框一致。
+        """
+        if self.parseTimer.isActive():
+            self.calculate_bits()
 
     def update_bits_from_value(self, value: int) -> None:
         """
@@ -240,19 +289,41 @@ class MainWindow(FluentWidget):
         Args:
             value: 用于更新比特位的整数值
         """
-        # 预先计算所有比特位的新值
-        new_bit_values = []
-        for bit in range(self.bitCount):
-            v = (value >> (self.bitCount - 1 - bit)) & 0x1
-            new_bit_values.append(v)
-        
-        # 只更新值发生变化的比特位
+        # 与当前显示值异或，只遍历发生变化的比特位
+        result = value & ((1 << self.bitCount) - 1)
+        changed = result ^ self.calculate_result()
+        while changed:
+            low = changed & -changed
+            bit = self.bitCount - low.bit_length()
+            v = 1 if result & low else 0
+            self.bitValue[bit] = v
+            self.bitEntry[bit].setText(str(v))
+            self.format_bit_entry(self.bitEntry[bit], v)
+            changed ^= low
+
+        self.checksumCard.set_value(result)
+        self.libraryCard.set_value(result)
+        self.compareCard.set_reference(result)
+        self.update_diff_highlight()
+
+    def set_compare_value(self, value: int) -> None:
+        """
+        以基准跟踪中的样本作为对比值 B；是否开启对比模式由用户决定。
+        """
+        self.compareCard.set_value(value)
+
+    def update_diff_highlight(self) -> None:
+        """
+        根据对比值更新差异比特位的高亮。
+
+        用一次异或得到差异掩码，只重绘差异状态发生变化的比特位。
+        """
+        mask = self.compareCard.diff_mask()
         for bit in range(self.bitCount):
-            if self.bitValue[bit] != new_bit_values[bit]:
-                self.bitValue[bit] = new_bit_values[bit]
-                v = new_bit_values[bit]
-                self.bitEntry[bit].setText(str(v))
-                self.format_bit_entry(self.bitEntry[bit], v)
+            is_diff = bool((mask >> (self.bitCount - 1 - bit)) & 1)
+            if self.bitDiff[bit] != is_diff:
+                self.bitDiff[bit] = is_diff
+                self.format_bit_entry(self.bitEntry[bit], self.bitValue[bit])
 
     def handle_bit_click(self, index: int) -> None:
         """
@@ -264,6 +335,7 @@ class MainWindow(FluentWidget):
         Args:
             index: 被点击的比特位索引
         """
+        self._flush_pending_parse()
         self.bitValue[index] = 1 - self.bitValue[index]
         v = self.bitValue[index]
 
@@ -279,10 +351,27 @@ class MainWindow(FluentWidget):
         
         当用户切换进制时，重新计算并显示结果，并更新输入验证器。
         """
+        # 先按切换前的进制完成未执行的更新，再切换解析器进制
+        self._flush_pending_parse()
+        self.inputParser.set_base(self.current_base())
         self._update_input_validator()
+        self.compareCard.set_base(self.current_base())
         result = self.calculate_result()
         self.set_result(result)
 
+    def current_base(self) -> int:
+        """
+        获取当前选择的进制。
+
+        Returns:
+            16、10 或 2
+        """
+        if self.decRadio.isChecked():
+            return 10
+        if self.binRadio.isChecked():
+            return 2
+        return 16
+
     def init_main_panel(self) -> None:
         """
         初始化主面板，创建所有比特位显示组件。
@@ -376,12 +465,33 @@ class MainWindow(FluentWidget):
         controls_layout.addWidget(type_card, 0, 0)
         controls_layout.addWidget(result_card, 0, 1, 1, 2)
         controls_layout.addWidget(func_widget, 0, 3)
+
+        self.compareCard = CompareCard()
+        self.compareCard.compareChanged.connect(self.update_diff_highlight)
+        controls_layout.addWidget(self.compareCard, 0, 4)
+
+        self.checksumCard = ChecksumCard()
+        controls_layout.addWidget(self.checksumCard, 1, 0, 1, 5)
+
+        self.traceCard = TraceCard()
+        self.traceCard.sampleChanged.connect(self.set_result)
+        self.traceCard.referenceChanged.connect(self.set_compare_value)
+        # 基准比较完成时开启一次对比模式，之后浏览样本不再强制开启
+        self.traceCard.compareFinished.connect(lambda _: self.compareCard.set_enabled(True))
+        self.traceCard.traceChanged.connect(self.checksumCard.set_trace)
+        controls_layout.addWidget(self.traceCard, 2, 0, 1, 5)
+
+        self.libraryCard = LibraryCard()
+        self.libraryCard.valueRecalled.connect(self.set_result)
+        controls_layout.addWidget(self.libraryCard, 0, 5, 3, 1)
         
         # 设置列拉伸比例，让结果面板占据更多空间
         controls_layout.setColumnStretch(0, 1)
         controls_layout.setColumnStretch(1, 2)
         controls_layout.setColumnStretch(2, 1)
         controls_layout.setColumnStretch(3, 1)
+        controls_layout.setColumnStretch(4, 1)
+        controls_layout.setColumnStretch(5, 2)
 
         self.main_layout.addWidget(controls_widget)
 
@@ -404,7 +514,15 @@ class MainWindow(FluentWidget):
         self.wordEntry.setAlignment(Qt.AlignmentFlag.AlignCenter)
         setFont(self.wordEntry, 14)  # 调整结果显示字体大小
         self.wordEntry.setMinimumHeight(35)  # 调整结果输入框高度
-        self.wordEntry.textEdited.connect(self.calculate_bits)
+        self.wordEntry.textEdited.connect(self.on_word_edited)
+        # 粘贴多行文本时转为跟踪导入
+        self.wordEntry.installEventFilter(self)
+        # 各进制的输入验证器只创建一次，切换进制时复用
+        self.wordValidators = {
+            16: QRegularExpressionValidator(QRegularExpression(r"[0-9A-Fa-f]*"), self.wordEntry),  # 十六进制，大小写不敏感
+            10: QRegularExpressionValidator(QRegularExpression(r"[0-9]*"), self.wordEntry),  # 十进制
+            2: QRegularExpressionValidator(QRegularExpression(r"[01]*"), self.wordEntry),  # 二进制
+        }
         # 设置初始输入验证器
         self._update_input_validator()
 
@@ -517,19 +635,8 @@ class MainWindow(FluentWidget):
         """
         根据当前选择的进制更新输入验证器。
         """
-        if self.hexRadio.isChecked():
-            # 十六进制验证器，允许0-9和A-F（大小写不敏感）
-            validator = QRegularExpressionValidator(QRegularExpression(r"[0-9A-Fa-f]*"), self.wordEntry)
-        elif self.decRadio.isChecked():
-            # 十进制验证器，允许0-9
-            validator = QRegularExpressionValidator(QRegularExpression(r"[0-9]*"), self.wordEntry)
-        elif self.binRadio.isChecked():
-            # 二进制验证器，允许0-1
-            validator = QRegularExpressionValidator(QRegularExpression(r"[01]*"), self.wordEntry)
-        else:
-            validator = None
-            
-        if validator:
+        validator = self.wordValidators[self.current_base()]
+        if self.wordEntry.validator() is not validator:
             self.wordEntry.setValidator(validator)
             
     def show_info_bar(self, title: str, content: str, type: str = "info") -> None:
@@ -582,17 +689,148 @@ class MainWindow(FluentWidget):
                 parent=self
             )
     
+    def eventFilter(self, obj, e) -> bool:
+        """
+        拦截结果输入框的粘贴操作：剪贴板为多行文本（hexdump、日志等）时导入为跟踪。
+        """
+        if obj is self.wordEntry and e.type() == QEvent.KeyPress and e.matches(QKeySequence.Paste):
+            text = QApplication.clipboard().text()
+            if "\n" in text.strip():
+                self.traceCard.import_text(text)
+                return True
+        return super().eventFilter(obj, e)
+
+    def set_keep_alive(self, enabled: bool) -> None:
+        """
+        设置预热模式。开启后关闭窗口只会将其隐藏，以便下次启动时直接显示。
+
+        Args:
+            enabled: 是否开启预热模式
+        """
+        self.keepAlive = enabled
+
+    def bring_to_front(self) -> None:
+        """
+        显示窗口并将其置于最前。
+        """
+        if self.isHidden():
+            self.showMaximized()
+        elif self.isMinimized():
+            self.showNormal()
+        self.raise_()
+        self.activateWindow()
+
+    def handle_instance_message(self, message: dict) -> None:
+        """
+        处理启动参数，或其他启动实例转发过来的参数。
+
+        Args:
+            message: 包含 value（数值文本）、base（hex/dec/bin）、file（要导入的跟踪文件）
+                和 show（是否显示窗口）的字典
+        """
+        radios = {"hex": self.hexRadio, "dec": self.decRadio, "bin": self.binRadio}
+        base_name = message.get("base")
+        if base_name in radios:
+            radios[base_name].setChecked(True)
+
+        text = message.get("value")
+        if text:
+            try:
+                self.set_result(int(str(text).strip(), self.current_base()) & ((1 << self.bitCount) - 1))
+            except ValueError:
+                self.show_info_bar("输入错误", f"无法解析数值：{text}", "warning")
+
+        if message.get("file"):
+            self.traceCard.load_file(message["file"])
+
+        if message.get("show", True):
+            self.bring_to_front()
+
     def closeEvent(self, e):
         """
         窗口关闭事件处理函数。
         
-        确保主题监听器线程正确停止，避免资源泄漏。
+        预热模式下只隐藏窗口；否则确保主题监听器线程正确停止、寄存器库正确关闭，避免资源泄漏。
         """
+        if self.keepAlive:
+            e.ignore()
+            self.hide()
+            return
+
         # 停止监听器线程
-        self.themeListener.terminate()
-        self.themeListener.deleteLater()
+        if self.themeListener is not None:
+            self.themeListener.terminate()
+            self.themeListener.deleteLater()
+            self.themeListener = None
+        self.libraryCard.close_library()
         super().closeEvent(e)
 
+    def set_low_power(self, enabled: bool) -> None:
+        """
+        设置低功耗模式。开启后关闭 Mica 特效、界面动画和输入框光标闪烁，减少空闲时的重绘和唤醒。
+
+        Args:
+            enabled: 是否开启低功耗模式
+        """
+        self.lowPower = enabled
+        self.setMicaEffectEnabled(not enabled)
+        for effect in (Qt.UI_AnimateMenu, Qt.UI_FadeMenu, Qt.UI_AnimateCombo,
+                       Qt.UI_AnimateTooltip, Qt.UI_FadeTooltip, Qt.UI_AnimateToolBox):
+            QApplication.setEffectEnabled(effect, not enabled)
+        # 获得焦点的输入框闪烁光标会周期性唤醒事件循环
+        QApplication.setCursorFlashTime(0 if enabled else self.cursorFlashTime)
+
+    def measure_idle(self, seconds: float) -> None:
+        """
+        统计指定时长内的定时器唤醒次数和 CPU 占用，结束后打印并提示结果。
+
+        Args:
+            seconds: 统计时长（秒）
+        """
+        self.idleMonitor = IdleMonitor(self)
+
+        def report(result: IdleReport) -> None:
+            print(result.summary())
+            self.show_info_bar(
+                "空闲统计",
+                f"{result.wakeups_per_second:.2f} 次唤醒/秒，CPU {result.cpu_percent:.2f}%",
+            )
+
+        self.idleMonitor.finished.connect(report)
+        self.idleMonitor.measure(seconds)
+
+    def nativeEvent(self, eventType, message):
+        """
+        Windows 消息处理：系统颜色设置变化时同步主题。
+        """
+        result = super().nativeEvent(eventType, message)
+        if sys.platform == "win32" and self._is_theme_setting_change(message):
+            # 一次设置变化会连续收到多条消息，放到事件循环中合并处理
+            QTimer.singleShot(0, self._sync_system_theme)
+        return result
+
+    @staticmethod
+    def _is_theme_setting_change(message) -> bool:
+        msg = MSG.from_address(int(message))
+        if msg.message != WM_SETTINGCHANGE or not msg.lParam:
+            return False
+        return ctypes.wstring_at(msg.lParam) == "ImmersiveColorSet"
+
+    def _sync_system_theme(self) -> None:
+        """
+        自动主题模式下，若系统主题与当前主题不一致则重新应用。
+        """
+        if qconfig.themeMode.value != Theme.AUTO:
+            return
+        if darkdetect.isDark() == isDarkTheme():
+            return
+        # themeMode 已是 AUTO 时 setTheme(Theme.AUTO) 不会重新读取系统主题，
+        # 与 SystemThemeListener 一样直接刷新缓存的主题并发出信号
+        qconfig.theme = Theme.AUTO
+        qconfig._cfg.themeChanged.emit(Theme.AUTO)
+        updateStyleSheet()
+        qconfig.themeChangedFinished.emit()
+
     def _onThemeChangedFinished(self):
         """
         主题变化完成后的回调函数。
@@ -602,7 +840,7 @@ class MainWindow(FluentWidget):
         super()._onThemeChangedFinished()
 
         # 云母特效启用时需要增加重试机制
-        if self.isMicaEffectEnabled():
+        if self.isMicaEffectEnabled() and not self.lowPower:
             QTimer.singleShot(100, lambda: self.windowEffect.setMicaEffect(self.winId(), isDarkTheme()))
 
     def on_theme_changed(self) -> None:
@@ -0,0 +1,242 @@
+import math
+from typing import Optional, Union
+from PyQt5.QtCore import Qt, QThread, pyqtSignal
+from PyQt5.QtWidgets import QApplication, QFileDialog, QHBoxLayout, QVBoxLayout, QWidget
+from qfluentwidgets import (
+    BodyLabel, CardWidget, InfoBar, InfoBarPosition, PushButton, Slider, SpinBox, setFont,
+)
+
+from config import MAX_BIT_COUNT
+from core.compare import compare_traces
+from core.replay import Replay, is_op_log, replay_file, replay_text, trace_values
+from core.trace_import import Trace, import_file, import_text
+
+# 识别格式时读取的文本开头长度
+_DETECT_SIZE = 65536
+
+
+def _load_text(text: str):
+    """
+    导入文本：操作日志按回放处理，其余按跟踪导入。
+    """
+    return replay_text(text) if is_op_log(text[:_DETECT_SIZE]) else import_text(text)
+
+
+def _load_file(path: str):
+    with open(path, "rb") as stream:
+        head = stream.read(_DETECT_SIZE)
+    return replay_file(path) if is_op_log(head) else import_file(path)
+
+
+def _compare_with_file(source):
+    """
+    导入基准跟踪并与当前跟踪比较，返回 (基准跟踪, 比较结果)。
+    """
+    trace, path = source
+    golden = _load_file(path)
+    return golden, compare_traces(trace_values(trace), trace_values(golden), MAX_BIT_COUNT)
+
+
+def _compare(source):
+    trace, golden = source
+    return golden, compare_traces(trace_values(trace), trace_values(golden), MAX_BIT_COUNT)
+
+
+class TraceLoader(QThread):
+    """
+    在后台线程中导入跟踪，避免大文件阻塞界面。
+    """
+    loaded = pyqtSignal(object)
+    failed = pyqtSignal(str)
+
+    def __init__(self, func, source, parent: Optional[QWidget] = None):
+        super().__init__(parent)
+        self.func = func
+        self.source = source
+
+    def run(self) -> None:
+        try:
+            self.loaded.emit(self.func(self.source))
+        except (OSError, ValueError) as e:
+            self.failed.emit(str(e))
+        except Exception as e:
+            # 线程中未捕获的异常会让面板一直停在"正在导入"，统一通过 failed 报告
+            self.failed.emit(f"{type(e).__name__}: {e}")
+
+
+class TraceCard(CardWidget):
+    """
+    跟踪面板：导入 xxd/hexdump/od/日志文本或回放操作日志，并逐个样本浏览；
+    导入基准跟踪后批量比较，浏览时同时给出基准中同一位置的样本用于 A/B 对比。
+    """
+    sampleChanged = pyqtSignal(object)  # 64 位值超出 C++ int 范围，按 Python 对象传递
+    referenceChanged = pyqtSignal(object)  # 基准跟踪中同一位置的样本
+    compareFinished = pyqtSignal(object)  # 与基准跟踪的批量比较结果
+    traceChanged = pyqtSignal(object)  # 更换了当前跟踪
+
+    def __init__(self, parent: Optional[QWidget] = None):
+        super().__init__(parent)
+        self.trace = None
+        self.golden = None
+        self.diff = None
+        self.loader = None
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(8, 8, 8, 8)
+        layout.setSpacing(5)
+
+        header_layout = QHBoxLayout()
+        title_label = BodyLabel("跟踪")
+        setFont(title_label, 10)
+        self.infoLabel = BodyLabel("未导入")
+        setFont(self.infoLabel, 9)
+
+        pasteButton = PushButton("粘贴导入")
+        setFont(pasteButton, 9)
+        pasteButton.clicked.connect(lambda: self.import_text(QApplication.clipboard().text()))
+        fileButton = PushButton("文件导入")
+        setFont(fileButton, 9)
+        fileButton.clicked.connect(self._choose_file)
+
+        header_layout.addWidget(title_label)
+        header_layout.addWidget(self.infoLabel, 1)
+        header_layout.addWidget(pasteButton)
+        header_layout.addWidget(fileButton)
+
+        nav_layout = QHBoxLayout()
+        self.slider = Slider(Qt.Orientation.Horizontal, self)
+        self.slider.setEnabled(False)
+        self.indexBox = SpinBox(self)
+        self.indexBox.setEnabled(False)
+        self.indexBox.setMinimumWidth(140)
+        self.slider.valueChanged.connect(self.indexBox.setValue)
+        self.indexBox.valueChanged.connect(self.slider.setValue)
+        self.indexBox.valueChanged.connect(self._on_index_changed)
+        nav_layout.addWidget(self.slider, 1)
+        nav_layout.addWidget(self.indexBox)
+
+        compare_layout = QHBoxLayout()
+        self.reportLabel = BodyLabel("未导入基准跟踪")
+        self.reportLabel.setTextInteractionFlags(Qt.TextInteractionFlag.TextSelectableByMouse)
+        setFont(self.reportLabel, 9)
+        self.goldenButton = PushButton("基准对比")
+        setFont(self.goldenButton, 9)
+        self.goldenButton.setEnabled(False)
+        self.goldenButton.clicked.connect(self._choose_golden)
+        self.nextButton = PushButton("下一处差异")
+        setFont(self.nextButton, 9)
+        self.nextButton.setEnabled(False)
+        self.nextButton.clicked.connect(self.jump_to_next_mismatch)
+        compare_layout.addWidget(self.reportLabel, 1)
+        compare_layout.addWidget(self.goldenButton)
+        compare_layout.addWidget(self.nextButton)
+
+        layout.addLayout(header_layout)
+        layout.addLayout(nav_layout)
+        layout.addLayout(compare_layout)
+
+    def import_text(self, text: str) -> None:
+        """
+        在后台导入文本（如剪贴板内容），格式自动识别。
+        """
+        if text.strip():
+            self._start_loader(_load_text, text)
+
+    def load_file(self, path: str) -> None:
+        """
+        在后台导入文件，格式自动识别。
+        """
+        self._start_loader(_load_file, path)
+
+    def set_trace(self, trace: Union[Trace, Replay]) -> None:
+        """
+        设置当前跟踪（或操作日志的回放）并显示第一个样本。
+        """
+        self.trace = trace
+        last = len(trace) - 1
+        for widget in (self.slider, self.indexBox):
+            widget.blockSignals(True)
+            widget.setRange(0, last)
+            widget.setValue(0)
+            widget.blockSignals(False)
+            widget.setEnabled(True)
+        self.goldenButton.setEnabled(True)
+        self.traceChanged.emit(trace)
+        self._on_index_changed(0)
+        if self.golden is not None:
+            # 更换了采集跟踪，与已导入的基准重新比较；由导入线程调用时等该线程结束后再开始
+            if self.loader is not None and self.loader.isRunning():
+                self.loader.finished.connect(self._recompare)
+            else:
+                self._recompare()
+
+    def _recompare(self) -> None:
+        self._start_loader(_compare, (self.trace, self.golden), self._on_compared, "正在比较...")
+
+    def load_golden(self, path: str) -> None:
+        """
+        在后台导入基准跟踪并与当前跟踪批量比较。
+        """
+        if self.trace is not None:
+            self._start_loader(_compare_with_file, (self.trace, path), self._on_compared, "正在比较...")
+
+    def jump_to_next_mismatch(self) -> None:
+        """
+        跳到当前样本之后的下一个不匹配区间，到末尾后从头开始。
+        """
+        if self.diff is None:
+            return
+        index = self.diff.next_mismatch(self.indexBox.value())
+        if index is None:
+            index = self.diff.next_mismatch(-1)
+        if index is not None:
+            self.indexBox.setValue(index)
+
+    def _choose_file(self) -> None:
+        path, _ = QFileDialog.getOpenFileName(self, "导入跟踪", "", "文本文件 (*.txt *.log *.hex *.dump);;所有文件 (*)")
+        if path:
+            self.load_file(path)
+
+    def _choose_golden(self) -> None:
+        path, _ = QFileDialog.getOpenFileName(self, "导入基准跟踪", "", "文本文件 (*.txt *.log *.hex *.dump);;所有文件 (*)")
+        if path:
+            self.load_golden(path)
+
+    def _start_loader(self, func, source, on_loaded=None, busy_text: str = "正在导入...") -> None:
+        if self.loader is not None and self.loader.isRunning():
+            return
+        self.infoLabel.setText(busy_text)
+        self.loader = TraceLoader(func, source, self)
+        self.loader.loaded.connect(on_loaded or self.set_trace)
+        self.loader.failed.connect(self._on_failed)
+        self.loader.start()
+
+    def _on_compared(self, result) -> None:
+        self.golden, self.diff = result
+        self.reportLabel.setText(self.diff.summary())
+        self.nextButton.setEnabled(bool(self.diff.mismatch_ranges))
+        self.compareFinished.emit(self.diff)
+        self._on_index_changed(self.indexBox.value())
+
+    def _on_failed(self, message: str) -> None:
+        self.infoLabel.setText("导入失败")
+        InfoBar.warning(
+            title="导入失败",
+            content=message,
+            orient=Qt.Orientation.Horizontal,
+            isClosable=True,
+            position=InfoBarPosition.TOP,
+            duration=3000,
+            parent=self.window()
+        )
+
+    def _on_index_changed(self, index: int) -> None:
+        if self.trace is None:
+            return
+        text = f"{self.trace.source_format} · 样本 {index + 1}/{len(self.trace)}"
+        if self.trace.timestamps is not None and not math.isnan(self.trace.timestamps[index]):
+            text += f" · 时间 {self.trace.timestamps[index]:g}"
+        self.infoLabel.setText(text)
+        self.sampleChanged.emit(self.trace.sample(index))
+        if self.golden is not None and index < len(self.golden):
+            self.referenceChanged.emit(self.golden.sample(index))
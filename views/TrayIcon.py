@@ -0,0 +1,38 @@
+from PyQt5.QtGui import QIcon
+from PyQt5.QtWidgets import QApplication, QSystemTrayIcon
+from qfluentwidgets import Action, SystemTrayMenu
+
+from config import APP_NAME, MAIN_ICON
+
+
+class TrayIcon(QSystemTrayIcon):
+    """
+    预热模式下的托盘图标，窗口关闭后隐藏到托盘，随时可以重新显示。
+    """
+
+    def __init__(self, window):
+        super().__init__(window)
+        self.window = window
+        self.setIcon(QIcon(MAIN_ICON))
+        self.setToolTip(APP_NAME)
+
+        self.menu = SystemTrayMenu(parent=window)
+        self.menu.addActions([
+            Action("显示", triggered=self.window.bring_to_front),
+            Action("退出", triggered=self.quit),
+        ])
+        self.setContextMenu(self.menu)
+        self.activated.connect(self._on_activated)
+
+    def _on_activated(self, reason: QSystemTrayIcon.ActivationReason) -> None:
+        if reason == QSystemTrayIcon.Trigger:
+            self.window.bring_to_front()
+
+    def quit(self) -> None:
+        """
+        退出预热模式并结束应用程序。
+        """
+        self.window.set_keep_alive(False)
+        self.window.close()
+        self.hide()
+        QApplication.quit()